@@ -0,0 +1,86 @@
+
+import os
+import time
+import argparse
+import pandas as pd
+
+from functools import partial
+from mngrdata import DataMngr
+from mngrplot import PlotMngr
+from mngrrender import RenderMngr
+
+
+METRICS = ['infected', 'ratio_infected', 'isolated', 'ratio_isolated', 'infected_isolated']
+CHARTS = ['map', 'barh']        # map animations are the slowest, so they are started first
+SUMMARY = 'batch-summary-{}.csv'
+
+
+def parse_args():
+    """
+    Returns parsed command line arguments
+    """
+    parser = argparse.ArgumentParser(description='Render all metric and chart variants from single data load')
+    parser.add_argument('--top', type=int, default=20, help='number of top cities/municipalities shown in results')
+    parser.add_argument('--stable', action='store_true', help='enable fixed axis, for all frames axis maximum limit is the same')
+    parser.add_argument('--days', nargs='*', default=[], help='days of still images, e.g. 2020-04-10')
+    parser.add_argument('--no-anim', dest='anim', action='store_false', help='render only still images')
+    parser.add_argument('--metrics', nargs='*', default=METRICS, choices=METRICS, help='rendered metrics')
+    parser.add_argument('--charts', nargs='*', default=CHARTS, choices=CHARTS, help='rendered chart types')
+    parser.add_argument('--workers', type=int, default=RenderMngr.WORKERS, help='number of worker processes')
+    parser.add_argument('--output', default=DataMngr.OUTPUT_DIR, help='output directory')
+    return parser.parse_args()
+
+
+def create_jobs(args):
+    """
+    Returns list of jobs (method, arguments, output directory, workers), animations before still images
+    Animations dominate the wall time, so workers are shared among them and each animation is rendered 
+    in segments across its share of workers
+    """
+    jobs = []
+    methods = ['{}_{}_plot'.format(metric, chart) for chart in args.charts for metric in args.metrics]
+    if args.anim:
+        anim_workers = max(1, args.workers // len(methods)) if len(methods) > 0 else 1
+        for method in methods:
+            plot_args = dict(top=args.top, anim=True, day=None, stable=args.stable, save=True)
+            jobs.append((method, plot_args, args.output, anim_workers))
+
+    # Still images of each day are saved into separate directory
+    for day in args.days:
+        for method in methods:
+            plot_args = dict(top=args.top, anim=False, day=day, stable=args.stable, save=True)
+            jobs.append((method, plot_args, os.path.join(args.output, day), 1))
+    return jobs
+
+
+def main():
+
+    args = parse_args()
+    start = time.perf_counter()
+
+    # Load data once for all jobs
+    data = DataMngr.load_build_data(info=False)
+    load_time = time.perf_counter() - start
+    print('Data loaded in {:.2f} s'.format(load_time))
+
+    # Render jobs
+    jobs = create_jobs(args)
+    render_job = partial(PlotMngr.render_job, data)
+    results = RenderMngr.render_batch(render_job, jobs, args.workers)
+    wall_time = time.perf_counter() - start
+
+    # Summary
+    summary = pd.DataFrame([(method, plot_args['day'], url, size, round(job_time, 3)) \
+        for (method, plot_args, _, _), (url, size, job_time) in zip(jobs, results)],
+        columns=['method', 'day', 'artifact', 'size', 'seconds'])
+    os.makedirs(args.output, exist_ok=True)
+    url_summary = os.path.join(args.output, SUMMARY.format(DataMngr.LANG))
+    summary.to_csv(url_summary, index=False)
+
+    print(summary.to_string(index=False))
+    print('Rendered {} artifacts ({:.1f} MB) with {} workers in {:.2f} s, summary saved into {}'.format(
+        len(summary), summary['size'].sum() / 2**20, args.workers, wall_time, url_summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import numpy as np
+
+from mngrsynth import SynthMngr
+
+
+SRC_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS = ['load_build', 'load_cached', 'select_top', 'barh_frame', 'map_frame', 'barh_encode', 'map_encode']
+THRESHOLD = 0.1
+
+
+def parse_args():
+    """
+    Returns parsed command line arguments
+    """
+    parser = argparse.ArgumentParser(description='Benchmark of data loading and rendering on synthetic inputs')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_size_args(command):
+        command.add_argument('--municipalities', type=int, default=150, help='number of synthetic cities/municipalities')
+        command.add_argument('--days', type=int, default=30, help='number of synthetic days')
+        command.add_argument('--seed', type=int, default=0, help='seed of synthetic data')
+        command.add_argument('--root', default=None, help='root directory of synthetic data, temporary directory by default')
+
+    generate = commands.add_parser('generate', help='generate synthetic input data')
+    add_size_args(generate)
+
+    run = commands.add_parser('run', help='run benchmarks, synthetic data is generated if it does not exist')
+    add_size_args(run)
+    run.add_argument('--benchmarks', nargs='*', default=BENCHMARKS, choices=BENCHMARKS, help='benchmarks to run')
+    run.add_argument('--top', type=int, default=20, help='number of top cities/municipalities shown in charts')
+    run.add_argument('--repeat', type=int, default=5, help='number of measured runs of load and selection benchmarks')
+    run.add_argument('--frames', type=int, default=50, help='number of measured frames of frame benchmarks')
+    run.add_argument('--day-frames', type=int, default=5, help='number of animation frames per day')
+    run.add_argument('--output', default=None, help='save results as JSON baseline into given file')
+    run.add_argument('--baseline', default=None, help='compare results with given JSON baseline')
+    run.add_argument('--threshold', type=float, default=THRESHOLD, help='allowed relative slowdown against baseline')
+
+    compare = commands.add_parser('compare', help='compare JSON results with baseline')
+    compare.add_argument('results', help='JSON results')
+    compare.add_argument('baseline', help='JSON baseline')
+    compare.add_argument('--threshold', type=float, default=THRESHOLD, help='allowed relative slowdown against baseline')
+    return parser.parse_args()
+
+
+def get_root(args):
+    """
+    Returns root directory of synthetic data for given size
+    """
+    if args.root is not None:
+        return os.path.abspath(args.root)
+    dirname = 'covid19-benchmark-{}x{}-{}'.format(args.municipalities, args.days, args.seed)
+    return os.path.join(tempfile.gettempdir(), dirname)
+
+
+def generate(args):
+    """
+    Generate synthetic data, returns its root directory
+    """
+    root_dir = get_root(args)
+    start = time.perf_counter()
+    SynthMngr(root_dir, args.municipalities, args.days, args.seed).generate(SRC_ROOT)
+    print('Generated {} cities/municipalities x {} days into {} in {:.2f} s'.format(
+        args.municipalities, args.days, root_dir, time.perf_counter() - start))
+    return root_dir
+
+
+def summarize(times, **extra):
+    """
+    Returns statistics of measured times in seconds
+    """
+    return dict(median=float(np.median(times)), min=float(np.min(times)), samples=len(times), **extra)
+
+
+def measure(func, repeat):
+    """
+    Returns statistics of repeated calls of func after one warm-up call
+    """
+    func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return summarize(times)
+
+
+def run_benchmarks(args, root_dir):
+    """
+    Returns results of selected benchmarks on synthetic data in given root directory
+    """
+    # Modules are imported after the root directory of data is set
+    os.environ['COVID19_ROOT'] = root_dir
+    import matplotlib
+    matplotlib.use('Agg')
+    import pandas as pd
+    import matplotlib.pyplot as plt
+    from mngrdata import DataMngr
+    from mngrplot import PlotMngr
+    from chartbarh import BarhChart
+    from chartmap import MapChart
+    from charttimeline import BarhTimeline, MapTimeline
+    from mngrmetric import MetricMngr
+    from mngrmatrix import MatrixStore
+    from mngrrank import RankIndex
+
+    DataMngr.DAY_FRAMES_BARH = args.day_frames
+    DataMngr.DAY_FRAMES_MAP = args.day_frames
+    DataMngr.OUTPUT_DIR = tempfile.mkdtemp(prefix='covid19-benchmark-')
+    target_col = DataMngr.INFECTED
+
+    def frame_cost(chart):
+        """
+        Returns statistics of drawing and rasterizing animation frames
+        """
+        chart.live = False
+        chart.verbose = False
+        chart.init_anim()
+        times = []
+        for i_frame in range(min(args.frames, chart.total_frames)):
+            start = time.perf_counter()
+            chart.draw_anim(i_frame, *chart.fargs)
+            chart.fig.canvas.draw()
+            times.append(time.perf_counter() - start)
+        plt.close(chart.fig)
+        return summarize(times)
+
+    def barh_chart(data):
+        ranks = RankIndex(MatrixStore(MetricMngr(data)), target_col)
+        chart = BarhChart('Benchmark', target_col, False, False, args.top)
+        timeline = BarhTimeline(args.top, DataMngr.DAY_FRAMES_BARH).compile(ranks)
+        chart.set_frames(num_groups=timeline.num_days, date_frames=timeline.date_frames, interval=DataMngr.INTERVAL_BARH)
+        chart.fargs = (timeline,)
+        return chart
+
+    def map_chart(data):
+        ranks = RankIndex(MatrixStore(MetricMngr(data)), target_col)
+        chart = MapChart('Benchmark', target_col, False, False, args.top)
+        chart.setup_axes()
+        timeline = MapTimeline(args.top, DataMngr.DAY_FRAMES_MAP, MapChart.ALPHA, MapChart.THRESHOLD).compile(ranks)
+        chart.set_frames(num_groups=timeline.num_days, date_frames=timeline.date_frames, interval=DataMngr.INTERVAL_MAP)
+        chart.fargs = (timeline,)
+        return chart
+
+    def encode(data, plot_method):
+        """
+        Returns statistics of rendering whole animation into video
+        """
+        pltmgr = PlotMngr(data=data, workers=1)
+        pltmgr.verbose = False
+        num_frames = data.index.nunique() * args.day_frames
+        times = []
+        for _ in range(max(1, args.repeat // 5)):
+            start = time.perf_counter()
+            getattr(pltmgr, plot_method)(top=args.top, anim=True, day=None, stable=False, save=True)
+            times.append(time.perf_counter() - start)
+        stats = summarize(times, frames=num_frames)
+        stats['fps'] = num_frames / stats['median']
+        return stats
+
+    results = {}
+    data = DataMngr.load_build_data(cache=False)
+    for name in args.benchmarks:
+        if name == 'load_build':
+            results[name] = measure(lambda: DataMngr.load_build_data(cache=False), args.repeat)
+        elif name == 'load_cached':
+            results[name] = measure(lambda: DataMngr.load_build_data(cache=True), args.repeat)
+        elif name == 'select_top':
+            results[name] = measure(lambda: PlotMngr.select_top(data, target_col, args.top), args.repeat)
+        elif name == 'barh_frame':
+            results[name] = frame_cost(barh_chart(data))
+        elif name == 'map_frame':
+            results[name] = frame_cost(map_chart(data))
+        elif name == 'barh_encode':
+            results[name] = encode(data, 'infected_barh_plot')
+        elif name == 'map_encode':
+            results[name] = encode(data, 'infected_map_plot')
+        print_result(name, results[name])
+
+    meta = dict(municipalities=args.municipalities, days=args.days, seed=args.seed, top=args.top,
+                day_frames=args.day_frames, rows=len(data), python=platform.python_version(),
+                numpy=np.__version__, pandas=pd.__version__, matplotlib=matplotlib.__version__,
+                platform=platform.platform(), cpus=os.cpu_count(), created=time.strftime('%Y-%m-%dT%H:%M:%S'))
+    return dict(meta=meta, results=results)
+
+
+def print_result(name, result):
+    fps = '   {:7.1f} fps'.format(result['fps']) if 'fps' in result else ''
+    print('{:<12} median {:9.2f} ms   min {:9.2f} ms   samples {:3d}{}'.format(
+        name, result['median'] * 1e3, result['min'] * 1e3, result['samples'], fps))
+
+
+def compare(results, baseline, threshold):
+    """
+    Print comparison of results with baseline
+    Returns list of benchmarks slower than baseline by more than threshold
+    """
+    for key in ['municipalities', 'days', 'top', 'day_frames']:
+        if results['meta'].get(key) != baseline['meta'].get(key):
+            print('Warning: {} differs from baseline ({} != {})'.format(key, results['meta'].get(key), baseline['meta'].get(key)))
+
+    regressions = []
+    for name, result in results['results'].items():
+        if name not in baseline['results']:
+            continue
+        ratio = result['median'] / baseline['results'][name]['median']
+        regressed = ratio > 1 + threshold
+        if regressed:
+            regressions.append(name)
+        print('{:<12} {:9.2f} ms   baseline {:9.2f} ms   {:+7.1%}{}'.format(
+            name, result['median'] * 1e3, baseline['results'][name]['median'] * 1e3, ratio - 1, '   REGRESSION' if regressed else ''))
+    return regressions
+
+
+def main():
+
+    args = parse_args()
+    if args.command == 'generate':
+        generate(args)
+        return
+
+    if args.command == 'compare':
+        with open(args.results) as file:
+            results = json.load(file)
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        sys.exit(1 if compare(results, baseline, args.threshold) else 0)
+
+    root_dir = get_root(args)
+    if not os.path.isdir(os.path.join(root_dir, 'data/input')):
+        generate(args)
+    results = run_benchmarks(args, root_dir)
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+        print('Results saved into {}'.format(args.output))
+
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        sys.exit(1 if compare(results, baseline, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+import numpy as np
+
+
+# Modules which must not be loaded by importing given module
+LAZY_MODULES = {
+    'mngrdata': ['geopandas', 'missingno', 'cv2', 'matplotlib.pyplot'],
+    'mngrcache': ['geopandas', 'missingno', 'cv2', 'matplotlib'],
+    'mngrplot': ['geopandas', 'missingno', 'cv2', 'seaborn', 'matplotlib.pyplot', 'matplotlib.animation'],
+}
+CODE = '''
+import sys, time, json
+start = time.perf_counter()
+import {module}
+end = time.perf_counter()
+print(json.dumps(dict(time=end - start, loaded=[name for name in {lazy} if name in sys.modules])))
+'''
+
+
+def parse_args():
+    """
+    Returns parsed command line arguments
+    """
+    parser = argparse.ArgumentParser(description='Benchmark of import time of modules, each import runs in fresh interpreter')
+    parser.add_argument('--modules', nargs='*', default=list(LAZY_MODULES.keys()), help='benchmarked modules')
+    parser.add_argument('--repeat', type=int, default=5, help='number of imports of each module')
+    parser.add_argument('--max-time', type=float, default=None, help='maximum allowed median import time in seconds')
+    return parser.parse_args()
+
+
+def measure(module, repeat):
+    """
+    Returns import times of module in seconds and list of lazy modules loaded by the import
+    """
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([src_dir, os.environ.get('PYTHONPATH', '')]))
+    code = CODE.format(module=module, lazy=repr(LAZY_MODULES.get(module, [])))
+
+    times = []
+    loaded = set()
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True)
+        info = json.loads(result.stdout.strip().splitlines()[-1])
+        times.append(info['time'])
+        loaded.update(info['loaded'])
+    return times, sorted(loaded)
+
+
+def main():
+
+    args = parse_args()
+    failed = False
+    for module in args.modules:
+        times, loaded = measure(module, args.repeat)
+        median = np.median(times)
+        print('{:<12} median {:7.1f} ms   min {:7.1f} ms   eagerly loaded: {}'.format(
+            module, median * 1e3, np.min(times) * 1e3, ', '.join(loaded) if loaded else '-'))
+
+        if loaded:
+            failed = True
+        if args.max_time is not None and median > args.max_time:
+            print('{:<12} exceeds maximum import time of {:.1f} ms'.format(module, args.max_time * 1e3))
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+
+import argparse
+
+from mngrserver import ServerMngr
+
+
+def parse_args():
+    """
+    Returns parsed command line arguments
+    """
+    parser = argparse.ArgumentParser(description='Local render server returning png images of charts')
+    parser.add_argument('--host', default='127.0.0.1', help='host name')
+    parser.add_argument('--port', type=int, default=8050, help='port number')
+    parser.add_argument('--workers', type=int, default=1, help='number of worker processes')
+    parser.add_argument('--cache-size', type=int, default=ServerMngr.CACHE_SIZE, help='number of cached responses')
+    parser.add_argument('--queue-size', type=int, default=ServerMngr.QUEUE_SIZE, help='maximum number of pending requests')
+    parser.add_argument('--verbose', action='store_true', help='log requests')
+    return parser.parse_args()
+
+
+def main():
+
+    args = parse_args()
+    srvmngr = ServerMngr(workers=args.workers, cache_size=args.cache_size, queue_size=args.queue_size)
+    srvmngr.serve(args.host, args.port, args.verbose)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,12 @@ import numpy as np
 import pandas as pd
 import matplotlib as mpl
 import matplotlib.cm as cm 
-import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
-import matplotlib.animation as animation
 
 from matplotlib.ticker import MaxNLocator
+from matplotlib.collections import PolyCollection
 from mngrdata import DataMngr
+from mngrtrace import TraceMngr
 from chartbase import Chart
 
 
@@ -32,13 +32,9 @@ class BarhChart(Chart):
         self.date = None
         self.cities = None
         # Data
-        self.prev_cities = None
-        self.curr_cities = None
-        self.prev_sizes = None
-        self.curr_sizes = None
-        self.prev_pos = None
-        self.curr_pos = None
         self.local_max = -1
+        self.labels = None                      # applied text of each label
+        self.labels_xy = None                   # applied position of each label
 
     def create_cmap(self):
         """
@@ -115,277 +111,114 @@ class BarhChart(Chart):
         self.axes.grid(axis='x', which='major', linestyle='-', linewidth=0.5, zorder=0, color='gray', alpha=0.5)
         
         # Data objects
-        self.curr_pos = np.arange(0, self.top, 1, dtype=np.int64)
-        self.curr_cities = np.array([''] * self.top)
-        self.curr_sizes = np.array(([0] * self.top), dtype=np.float64)
         self.colors = np.array(self.cmap(np.arange(self.top-1, -1, -1)))
+        ys = np.arange(0, self.top, 1, dtype=np.float64)
+        ws = np.zeros(self.top, dtype=np.float64)
 
         # Artist objects
-        self.bars = np.array(self.axes.barh(self.curr_pos, self.curr_sizes, align='edge', height=BarhChart.HEIGHT, alpha=BarhChart.ALPHA))
-        self.cities = np.array([self.axes.text(0, 0, '', ha='left', va='center') for bar in self.bars])
+        self.bars = PolyCollection(BarhChart.calc_verts(ys, ws), facecolors=self.colors, edgecolors='none', linewidths=0)
+        self.axes.add_collection(self.bars, autolim=False)
+        self.cities = np.array([self.axes.text(0, 0, '', ha='left', va='center') for _ in range(self.top)])
+        self.labels = np.full(self.top, '', dtype=object)
+        self.labels_xy = np.zeros((self.top, 2), dtype=np.float64)
         self.date = self.axes.text(0.95, 0.1, '', ha='right', color='gray', transform=self.axes.transAxes, fontsize=45, alpha=BarhChart.ALPHA, \
             bbox=dict(facecolor='w', edgecolor='w', boxstyle='round'))
         self.news = self.axes.text(0.45, 0.5, '', ha='left', color='black', transform=self.axes.transAxes, fontsize=10, wrap=True, \
             bbox=dict(facecolor='floralwhite', edgecolor='moccasin', boxstyle='round'))
 
-        changed = [bar for bar in self.bars] + [city for city in self.cities] + [self.date] + [self.news]
+        # Grid and left spine are drawn over the bars
+        changed = [self.bars] + [city for city in self.cities] + [self.date] + [self.news] + [self.axes.xaxis, self.axes.spines['left']]
         return changed
 
-    def calc_positions_change(self, prev_cities, curr_cities):
-        """
-        Calculating positions change between previous and current cities list
-        Returns new positions for common cities
-        """
-        # Update previous
-        self.prev_pos = np.arange(0, self.top, 1)
-        self.curr_pos = np.zeros(self.top, dtype=np.int64)
-
-        # Calculate new
-        for i, city in enumerate(prev_cities):
-            ind = np.argwhere(city == curr_cities).flatten()
-            self.curr_pos[i] = ind[0] if len(ind) > 0 else -1
-
-        # missing values indicates new cities
-        return
-        
-    def update_existing_cities(self, i_frame):
-        """
-        Update positions and values of existing cities
-        """
-        # Artist
-        exist_pos_art = np.argwhere(self.curr_pos != -1).flatten()
-        if len(exist_pos_art) <= 0:
-            return
-
-        exist_cities_txt = self.cities[exist_pos_art]
-        exist_bars = self.bars[exist_pos_art]
-        exist_colors = self.colors[exist_pos_art]
-
-        # Data
-        exist_pos = exist_pos_art
-        exist_cities_names = self.prev_cities[exist_pos]
-        
-        y_step = (self.curr_pos[exist_pos] - self.prev_pos[exist_pos]) / (self.date_frames - 1)
-        w_step = (self.curr_sizes[self.curr_pos[exist_pos]] - self.prev_sizes[exist_pos]) / (self.date_frames - 1)
-
-        ys = self.prev_pos[exist_pos] + (y_step * i_frame)
-        ws = self.prev_sizes[exist_pos] + (w_step * i_frame)
-
-        for i, bar in enumerate(exist_bars):
-            y = ys[i]
-            bar.set_y(y)
-            w = ws[i]
-            bar.set_width(w)
-            bar.set_color(exist_colors[i])
-
-            y_txt = y + bar.get_height() / 2.0
-            x_txt = w + (self.xmax / 200 if self.stable else self.local_max / 200)
-            city_name = exist_cities_names[i]
-            val = '{:.2f}'.format(w) if self.ratio else str(int(round(w, 0)))
-            city = exist_cities_txt[i]
-            city.set_text(city_name + '\n' + val)
-            city.set_x(x_txt)
-            city.set_y(y_txt)
-            
-            if abs(w) < BarhChart.LIMIT: 
-                city.set_text('')
-                bar.set_color(None)
-
-            if not self.stable and self.local_max < w:
-                self.local_max = w
-                self.set_xlim(0, self.local_max)
-
-        # Clean possible decimal errors
-        if i_frame == self.date_frames - 1:
-            for i, bar in enumerate(exist_bars):
-                y = round(bar.get_y(), 0)
-                bar.set_y(y)
-                curr_val = self.curr_sizes[self.curr_pos[exist_pos]][i]
-                bar.set_width(curr_val)
-        return
-
-    def update_old_cities(self, i_frame):
-        """
-        Update positions of old cities
-        """
-        # Artist
-        old_pos_art = np.argwhere(self.curr_pos == -1).flatten()
-        if len(old_pos_art) <= 0:
-            return
-
-        old_cities_txt = self.cities[old_pos_art]
-        old_bars = self.bars[old_pos_art]
-        old_colors = self.colors[old_pos_art]
-
-        # Data
-        old_pos = old_pos_art
-        old_cities_names = self.prev_cities[old_pos]
-
-        y_step = (self.curr_pos[old_pos] - self.prev_pos[old_pos]) / (self.date_frames / 2 - 1)
-        #w_step = ((0) - self.prev_sizes[old_pos]) / (self.date_frames / 2 - 1)
-
-        ys = self.prev_pos[old_pos] + (y_step * i_frame)
-        #ws = self.prev_sizes[old_pos] + (w_step * i_frame)
-
-        for i, bar in enumerate(old_bars):
-            y = ys[i]
-            bar.set_y(y)
-            #w = ws[i]
-            #bar.set_width(w)
-            bar.set_color(old_colors[i])
-
-            y_txt = y + bar.get_height() / 2.0
-            x_txt = bar.get_width() + (self.xmax / 200 if self.stable else self.local_max / 200)
-            city_name = old_cities_names[i] 
-            prev_val = self.prev_sizes[old_pos][i]
-            val = '{:.2f}'.format(prev_val) if self.ratio else str(int(prev_val))
-            city = old_cities_txt[i]
-            city.set_text(city_name + '\n' + val)
-            city.set_x(x_txt)
-            city.set_y(y_txt)
-
-            if abs(prev_val) < BarhChart.LIMIT: 
-                city.set_text('')
-                bar.set_color(None)
-
-        # Clean possible decimal errors
-        if i_frame == self.date_frames // 2:
-            for bar in old_bars:
-                bar.set_y(-1)
-                bar.set_width(0)
+    @staticmethod
+    def calc_verts(ys, ws):
+        """
+        Returns vertices of horizontal bars with given bottom positions and widths
+        """
+        verts = np.zeros((len(ys), 4, 2), dtype=np.float64)
+        verts[:, 1:3, 1] = (ys + BarhChart.HEIGHT)[:, np.newaxis]
+        verts[:, [0, 3], 1] = ys[:, np.newaxis]
+        verts[:, 2:4, 0] = ws[:, np.newaxis]
+        return verts
+
+    def apply_frame(self, ys, ws, vals, names, cids):
+        """
+        Apply positions, widths, colour indexes and labels to all bars at once,
+        only labels with changed text or position are updated
+        """
+        # Bars
+        visible = np.abs(vals) >= BarhChart.LIMIT
+        colors = self.colors[cids]
+        colors[:, 3] = np.where(visible, BarhChart.ALPHA, 0)
+        self.bars.set_verts(BarhChart.calc_verts(ys, ws))
+        self.bars.set_facecolor(colors)
+
+        # Labels
+        vals_txt = np.char.mod('%.2f', vals) if self.ratio else np.char.mod('%d', np.round(vals))
+        labels = np.where(visible, np.char.add(np.char.add(names, '\n'), vals_txt), '')
+        xy = np.column_stack((ws + (self.xmax / 200 if self.stable else self.local_max / 200), ys + BarhChart.HEIGHT / 2.0))
+        xy[labels == ''] = 0
+        changed = np.flatnonzero((labels != self.labels) | (xy != self.labels_xy).any(axis=1))
+        for i in changed:
+            self.cities[i].set_text(labels[i])
+            self.cities[i].set_position(xy[i])
+        self.labels[changed] = labels[changed]
+        self.labels_xy[changed] = xy[changed]
         return
 
-    def update_new_cities(self, i_frame):
+    def update_scale(self, i_frame, timeline):
         """
-        Update positions and values for new cities
+        Update X-axis limit from precomputed scale, the limit is changed only when the scale is changed
         """
-        # Artist
-        new_pos_art = np.argwhere(self.curr_pos == -1).flatten()
-        if len(new_pos_art) <= 0:
+        if self.stable:
             return
-
-        new_cities_txt = self.cities[new_pos_art]
-        new_bars = self.bars[new_pos_art]
-        new_colors = self.colors[new_pos_art] 
-
-        # Data
-        new_pos = np.setdiff1d(np.arange(0, self.top, 1), self.curr_pos)
-        new_cities_names = self.curr_cities[new_pos]
-
-        y_step = (new_pos - (-1)) / (self.date_frames / 2 - 1)
-        w_step = (self.curr_sizes[new_pos] - (0)) / (self.date_frames / 2 - 1)
-
-        i_frame_p2 = i_frame % (self.date_frames // 2)
-        ys = -1 + (y_step * i_frame_p2)
-        ws = 0 + (w_step * i_frame_p2)
-
-        for i, bar in enumerate(new_bars):
-            y = ys[i]
-            bar.set_y(y)
-            w = ws[i]
-            bar.set_width(w)
-            bar.set_color(new_colors[i])
-
-            y_txt = y + bar.get_height() / 2.0
-            x_txt = bar.get_width() + (self.xmax / 200 if self.stable else self.local_max / 200)
-            city_name = new_cities_names[i]
-            val = '{:.2f}'.format(w) if self.ratio else str(int(round(w, 0)))
-            city = new_cities_txt[i]
-            city.set_text(city_name + '\n' + val)
-            city.set_x(x_txt)
-            city.set_y(y_txt)
-
-            if abs(w) < BarhChart.LIMIT: 
-                city.set_text('')
-                bar.set_color(None)
-            
-            if not self.stable and self.local_max < w:
-                self.local_max = w
-                self.set_xlim(0, self.local_max)
-
-        # Clean possible decimal errors
-        if i_frame == self.date_frames - 1:
-            for i, bar in enumerate(new_bars):
-                y = round(bar.get_y(), 0)
-                bar.set_y(y)
-                w = self.curr_sizes[new_pos][i]
-                bar.set_width(w)
+        local_max = timeline.scale[i_frame]
+        if local_max != self.local_max:
+            self.local_max = local_max
+            self.set_xlim(0, self.local_max)
         return
 
-    def update_positions(self, i_frame):
+    def update_positions(self, i_frame, timeline):
         """
-        Update position of bars
+        Update position of bars from compiled timeline
         """
-        i_frame = i_frame % self.date_frames
-
-        self.update_existing_cities(i_frame)
+        ws = timeline.ws[i_frame]
+        self.apply_frame(timeline.ys[i_frame], ws, ws, timeline.names[timeline.ids[i_frame]], timeline.cids[i_frame])
 
-        if i_frame < self.date_frames // 2:
-            self.update_old_cities(i_frame)
-        else:
-            self.update_new_cities(i_frame)
-
-        changed = [bar for bar in self.bars] + [city for city in self.cities]
+        changed = [self.bars] + [city for city in self.cities]
         return changed
 
-    def draw_anim(self, i_frame, data, target_col):
+    def draw_anim(self, i_frame, timeline):
         """
-        Drawing horizontal bar chart for the target column by cities/municipalities
+        Drawing horizontal bar chart from compiled timeline of the target column by cities/municipalities
         """
         # New day
         if i_frame % self.date_frames == 0:
-
-            # Update artists
-            bars_ranks = np.vectorize(lambda bar: bar.get_y())(self.bars)
-            order = np.argsort(bars_ranks, kind='mergesort')
-            self.bars = self.bars[order]
-            self.cities = self.cities[order]
-            self.colors = self.colors[order]
-
-            # Update previous data
-            self.prev_cities = self.curr_cities.copy()
-            self.prev_sizes = self.curr_sizes.copy()
-
-            # Calculate for new day
             ind_day = i_frame // self.date_frames
-            day = list(data.groups.keys())[ind_day]
-            data = data.get_group(day)
-            self.curr_cities = np.array(data[DataMngr.CITY].reset_index(drop=True).values)
-            self.curr_sizes = np.array(data[target_col].reset_index(drop=True).values)
-            self.calc_positions_change(self.prev_cities, self.curr_cities)
+            day = timeline.days[ind_day]
 
             # Artist
             day_str = DataMngr.date_to_str(day)
             self.date.set_text(day_str)
-
-            if day in self.the_news.index:
-                curr_news = self.the_news[day].split('.')
-                lines = '.\n'.join(curr_news).strip()
-                news_txt = '{}\n {}'.format(day_str, lines)
-                self.news.set_text(news_txt)
-                self.duration = Chart.NEWS_TIME
-            elif self.duration == 0:
-                self.news.set_text('')
-                self.duration = Chart.NEWS_TIME
-            else:
-                self.duration -= 1
+            self.update_news(day, day_str)
 
             # Info
-            print(day_str)
-            for i, city in enumerate(zip(reversed(self.curr_cities), reversed(self.curr_sizes))):
-                print(self.top - 1 - i, city)
-            print()
-
-            # Update axes for first day
-            if not self.stable and i_frame == 0:
-                maxval = data[target_col].max()
-                self.local_max = maxval
-                self.set_xlim(0, self.local_max)
+            if self.verbose:
+                with TraceMngr.span('BarhChart.info', 'frame'):
+                    print(day_str)
+                    curr_cities = timeline.names[timeline.day_ids[ind_day]]
+                    curr_sizes = timeline.day_values[ind_day]
+                    for i, city in enumerate(zip(reversed(curr_cities), reversed(curr_sizes))):
+                        print(self.top - 1 - i, city)
+                    print()
 
         # Update 
-        pos_changed = self.update_positions(i_frame)
-        self.fig.canvas.draw()
-        self.fig.canvas.flush_events()
+        with TraceMngr.span('BarhChart.update_scale', 'frame'):
+            self.update_scale(i_frame, timeline)
+        with TraceMngr.span('BarhChart.update_positions', 'frame'):
+            pos_changed = self.update_positions(i_frame, timeline)
+        if self.live:
+            self.blit_frame()
 
         changed = pos_changed + [self.date] + [self.news]
         return changed
@@ -1,15 +1,18 @@
 
-import os, sys, cv2
+import os, sys
 import numpy as np
 import pandas as pd
 import matplotlib as mpl
 import matplotlib.cm as cm 
-import matplotlib.pyplot as plt
+import matplotlib.style
 import matplotlib.colors as mcolors
-import matplotlib.animation as animation
 import matplotlib.image as image
 
+from functools import partial
 from mngrdata import DataMngr
+from mngrasset import AssetMngr
+from mngrtrace import TraceMngr
+from chartwriter import PipeWriter
 
 
 class Chart:
@@ -37,6 +40,7 @@ class Chart:
         self.norm = None
         self.date_frames = None
         self.total_frames = None
+        self.interval = None
 
         # Axes margins
         self.stable = stable
@@ -49,6 +53,17 @@ class Chart:
         self.fig = self.create()
         self.axes = self.fig.gca()
         self.anim = None
+        self.news = None
+        self.fargs = None
+        self.segment = None
+        self.live = True
+        self.verbose = True
+        self.output = None          # file-like object for saved image instead of output file
+
+        # Blitting
+        self.animated = []
+        self.background = None
+        self.i_frame = 0
 
         # Data
         self.the_news = DataMngr.load_news()
@@ -58,13 +73,36 @@ class Chart:
         """
         Returns new initialized new figure
         """
-        plt.style.use(self.style) 
+        Chart.use_style(self.style)
+        import matplotlib.pyplot as plt
         fig = plt.figure(figsize=(self.width, self.height), dpi=self.dpi, facecolor=self.bgcolor)
         axes = fig.gca()
         axes.set_title(self.title, pad=0)
         axes.set_xlabel(self.xlabel)
         return fig
 
+    @staticmethod
+    def read_style(style):
+        """
+        Returns parameters of matplotlib style, None if style is not found in the library
+        """
+        if style not in mpl.style.library:
+            return None
+        params = {key: val for key, val in mpl.style.library[style].items() if key not in mpl.style.core.STYLE_BLACKLIST}
+        return params
+
+    @staticmethod
+    def use_style(style):
+        """
+        Apply matplotlib style with cached parameters
+        """
+        params = AssetMngr.load(None, partial(Chart.read_style, style), 'style', style)
+        if params is None:
+            mpl.style.use(style)
+        else:
+            mpl.rcParams.update(params)
+        return
+
     def set_xlim(self, xmin, xmax, axes=None):
         """
         Set limits for X-axis
@@ -75,6 +113,7 @@ class Chart:
             self.axes.set_xlim(xmin=xmin, xmax=xmax)
         else:
             axes.set_xlim(xmin=xmin, xmax=xmax)
+        self.invalidate()
         return
 
     def set_ylim(self, ymin, ymax, axes=None):
@@ -87,6 +126,7 @@ class Chart:
             self.axes.set_ylim(ymin=ymin, ymax=ymax)
         else:
             axes.set_ylim(ymin=ymin, ymax=ymax)
+        self.invalidate()
         return
 
     def get_color(self, val):
@@ -107,40 +147,183 @@ class Chart:
         if (not self.ymin is None) and (not self.ymax is None):
             self.set_ylim(self.ymin, self.ymax)
 
+    def add_logo(self):
+        """
+        Add logo to the figure
+        """
+        url_img = os.path.join(DataMngr.LOGO_DIR, DataMngr.LOGO_FILENAME)
+        img = AssetMngr.load(url_img, partial(Chart.read_logo, url_img, DataMngr.LOGO_SIZE), DataMngr.LOGO_SIZE)
+        self.fig.figimage(img, Chart.LOGO_X, Chart.LOGO_Y, zorder=3, alpha=self.logo_alpha)
+        return
+
+    @staticmethod
+    def read_logo(url, size):
+        """
+        Returns logo image resized to given size
+        """
+        import cv2
+        img = image.imread(url)
+        img = cv2.resize(img, (size, size))
+        return img
+
+    @staticmethod
+    def get_url(filename, extension):
+        """
+        Returns location of the output file
+        """
+        os.makedirs(DataMngr.OUTPUT_DIR, exist_ok=True)
+        return os.path.join(DataMngr.OUTPUT_DIR, '{}-{}.{}'.format(filename, DataMngr.LANG, extension))
+
+    def update_news(self, day, day_str):
+        """
+        Show the News of given day, the News are hidden after NEWS_TIME days without new ones
+        """
+        if day in self.the_news.index:
+            curr_news = self.the_news[day].split('.')
+            lines = '.\n'.join(curr_news).strip()
+            news_txt = '{}\n {}'.format(day_str, lines)
+            self.news.set_text(news_txt)
+            self.duration = Chart.NEWS_TIME
+        elif self.duration == 0:
+            self.news.set_text('')
+            self.duration = Chart.NEWS_TIME
+        else:
+            self.duration -= 1
+        return
+
+    @TraceMngr.traced('chart')
     def display(self, to_save, filename):
         """
         Show plot or save figure
         Parameters:
             to_save  - enable saving plot, otherwise just show results on screen 
             filename - name of the file
+        Returns location of saved file, None if plot is shown on screen
         """
-        url_img = os.path.join(DataMngr.LOGO_DIR, DataMngr.LOGO_FILENAME)
-        img = image.imread(url_img)
-        img = cv2.resize(img, (DataMngr.LOGO_SIZE, DataMngr.LOGO_SIZE))
-        self.fig.figimage(img, Chart.LOGO_X, Chart.LOGO_Y, zorder=3, alpha=self.logo_alpha)
+        import matplotlib.pyplot as plt
+        self.add_logo()
 
+        url = None
         if to_save:
-            if self.anim is None:
-                url_img = os.path.join(DataMngr.OUTPUT_DIR, '{}-{}.png'.format(filename, DataMngr.LANG))
-                self.fig.savefig(url_img, dpi=self.dpi, facecolor=self.bgcolor)
+            if self.fargs is None and self.output is not None:
+                self.fig.savefig(self.output, format='png', dpi=self.dpi, facecolor=self.bgcolor)
+            elif self.fargs is None:
+                url = Chart.get_url(filename, 'png')
+                self.fig.savefig(url, dpi=self.dpi, facecolor=self.bgcolor)
+            elif self.segment is None:
+                url = Chart.get_url(filename, 'mp4')
+                self.save_frames(url, 0, self.total_frames)
             else:
-                url_anim = os.path.join(DataMngr.OUTPUT_DIR, '{}-{}.mp4'.format(filename, DataMngr.LANG))
-                self.anim.save(url_anim, writer='ffmpeg', dpi=self.dpi, bitrate=-1, \
-                    codec='libx264', extra_args=['-pix_fmt', 'yuv420p'], savefig_kwargs=dict(facecolor=self.bgcolor))
+                start, end, url = self.segment
+                self.save_frames(url, start, end)
         else:
             mng = plt.get_current_fig_manager()
             mng.full_screen_toggle()
             plt.show()
 
         plt.close()
+        return url
+
+    @TraceMngr.traced('chart')
+    def save_frames(self, url, start, end):
+        """
+        Save range of animation frames [start, end) into video file, 
+        preceding frames are only replayed to restore the state of animation
+        """
+        live = self.live
+        self.live = False
+
+        self.init_anim()
+        for i_frame in range(start):
+            self.draw_anim(i_frame, *self.fargs)
+
+        with PipeWriter(self.fig, url, fps=1000. / self.interval) as writer:
+            for i_frame in range(start, end):
+                with TraceMngr.span('frame', 'frame'):
+                    self.draw_anim(i_frame, *self.fargs)
+                    writer.grab_frame()
+
+        if self.verbose:
+            print('Saved {} frames into {} at {:.1f} fps'.format(writer.num_frames, url, writer.achieved_fps))
+        self.live = live
+        return
+
+    def play(self):
+        """
+        Play animation on screen, the static background is rendered once and cached,
+        while only animated artists are redrawn on top of it in every frame
+        """
+        self.live = True
+        self.i_frame = 0
+        self.animated = self.init_anim()
+        for artist in self.animated:
+            artist.set_animated(True)
+
+        self.anim = self.fig.canvas.new_timer(interval=self.interval)
+        self.anim.add_callback(self.next_frame)
+        self.fig.canvas.mpl_connect('draw_event', self.on_draw)
+        return
+
+    def next_frame(self):
+        """
+        Draw next frame of animation, the animation is stopped after the last frame
+        """
+        if self.i_frame >= self.total_frames:
+            self.anim.stop()
+            return
+        self.draw_anim(self.i_frame, *self.fargs)
+        self.i_frame += 1
+        return
+
+    def on_draw(self, event):
+        """
+        Cache static background after every full redraw of the canvas and draw animated artists on top,
+        the animation is started after the first redraw
+        """
+        canvas = self.fig.canvas
+        self.background = canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_animated()
+        if self.i_frame == 0:
+            self.anim.start()
+        return
+
+    def invalidate(self):
+        """
+        Invalidate cached static background, e.g. after change of axis limits or color bar
+        """
+        self.background = None
+        return
+
+    def draw_animated(self):
+        """
+        Draw animated artists on the canvas in order of their z-order
+        """
+        for artist in sorted(self.animated, key=lambda artist: artist.get_zorder()):
+            self.fig.draw_artist(artist)
+        return
+
+    @TraceMngr.traced('chart')
+    def blit_frame(self):
+        """
+        Show current frame, full redraw of the canvas is done only if cached static background is invalid
+        """
+        canvas = self.fig.canvas
+        if self.background is None:
+            canvas.draw()
+        else:
+            canvas.restore_region(self.background)
+            self.draw_animated()
+            canvas.blit(self.fig.bbox)
+        canvas.flush_events()
         return
 
-    def set_frames(self, num_groups, date_frames):
+    def set_frames(self, num_groups, date_frames, interval):
         """
-        Set number total number of frames and number of frames per date
+        Set number total number of frames, number of frames per date and delay between frames in milliseconds
         """
         self.date_frames = date_frames
         self.total_frames = num_groups * date_frames
+        self.interval = interval
         return
 
 
@@ -0,0 +1,158 @@
+import numpy as np
+
+from collections import OrderedDict
+from matplotlib.font_manager import FontProperties
+from matplotlib.textpath import TextToPath
+
+
+class LabelPlacer:
+    """
+    Places captions of cities/municipalities so they overlap neither each other nor locations and bars of other cities,
+    captions are placed greedily against R-tree of already occupied boxes in O(n log n),
+    placements are cached per set of shown cities/municipalities and heights of their bars rounded up to HEIGHT_STEP
+    """
+
+    MAX_PLACEMENTS = 256
+    PAD = 0.1                                   # padding of caption box in caption heights
+    MARKER_HEIGHT = 0.01                        # half height of location box in data units
+    HEIGHT_STEP = 0.1                           # bar heights are rounded up to multiple of step in data units
+    LEADER_RADII = [1.5, 2.5, 3.5]              # distances of leader captions from location in caption heights
+    LEADER_ANGLES = [-90, -60, -120, -30, -150, 0, 180, -15, -165]     # directions below and beside the bar
+
+
+    def __init__(self, fontsize, offset, marker, bar_width):
+        """
+        Parameters:
+            fontsize    - font size of captions in points
+            offset      - vertical offset of caption baseline below location in data units
+            marker      - half width of location box which must not be covered by other captions in data units
+            bar_width   - width of vertical bar above location in data units
+        """
+        self.prop = FontProperties(size=fontsize)
+        self.offset = offset
+        self.marker = marker
+        self.bar_width = bar_width
+        self.text_path = TextToPath()
+        self.directions = [(float(np.cos(angle)), float(np.sin(angle))) for angle in np.radians(self.LEADER_ANGLES)]
+        self.scale = None                       # data units per point
+        self.sizes = {}                         # name -> width, height and descent of caption in data units
+        self.placements = OrderedDict()         # set of (name, height steps) -> {name: (x, y, leader segment or None)}
+
+    def set_scale(self, axes):
+        """
+        Set scale of captions from current size and limits of the axes, cached placements are dropped if it is changed
+        """
+        axes.apply_aspect()
+        (x0, y0), (x1, y1) = axes.transData.inverted().transform([(0, 0), (1, 1)])
+        scale = (max(abs(x1 - x0), abs(y1 - y0)) * axes.figure.dpi / 72)
+        if scale != self.scale:
+            self.scale = scale
+            self.sizes = {}
+            self.placements.clear()
+        return
+
+    def get_size(self, name):
+        """
+        Returns width, height and descent of caption in data units
+        """
+        size = self.sizes.get(name)
+        if size is None:
+            width, height, descent = self.text_path.get_text_width_height_descent(name, self.prop, ismath=False)
+            pad = self.PAD * height
+            size = ((width + pad) * self.scale, (height + pad) * self.scale, (descent + pad / 2) * self.scale)
+            self.sizes[name] = size
+        return size
+
+    def get_candidates(self, x, y, size):
+        """
+        Returns candidate positions of caption baseline center for location, in order of preference,
+        with flag whether the caption needs leader line
+        """
+        width, height, descent = size
+        base = y - self.offset
+        side = y - (height - 2 * descent) / 2
+        candidates = [(x, base, False),
+                      (x - width / 2, base, False),
+                      (x + width / 2, base, False),
+                      (x - width / 2 - self.marker, side, False),
+                      (x + width / 2 + self.marker, side, False),
+                      (x, base - height, False)]
+        for radius in self.LEADER_RADII:
+            for dx, dy in self.directions:
+                cx = x + dx * (radius * height + width / 2 * abs(dx))
+                cy = y + dy * radius * height
+                candidates.append((cx, cy - (height - 2 * descent) / 2, True))
+        return candidates
+
+    @staticmethod
+    def get_box(px, py, size):
+        """
+        Returns box of caption with given baseline center
+        """
+        width, height, descent = size
+        return (px - width / 2, py - descent, px + width / 2, py + height - descent)
+
+    def calc_placement(self, xs, ys, hs, names):
+        """
+        Returns caption position and leader segment of each city/municipality
+        Captions are placed from north to south, each at the first candidate position which does not intersect
+        any placed caption, location or bar of other city/municipality, otherwise at default position
+        Location and bar of city/municipality have the same id, so its caption may overlap its own bar
+        """
+        from rtree import index
+
+        num = len(names)
+        if num == 0:
+            return {}
+        markers = [(i, (x - self.marker, y - self.MARKER_HEIGHT, x + self.marker, y + self.MARKER_HEIGHT), None)
+                   for i, (x, y) in enumerate(zip(xs, ys))]
+        bars = [(i, (x - self.bar_width / 2, y, x + self.bar_width / 2, y + h), None)
+                for i, (x, y, h) in enumerate(zip(xs, ys, hs)) if h > 0]
+        occupied = index.Index(iter(markers + bars))
+
+        placement = {}
+        for i in sorted(range(num), key=lambda i: (-ys[i], xs[i], names[i])):
+            x, y, name = xs[i], ys[i], names[i]
+            size = self.get_size(name)
+            candidates = self.get_candidates(x, y, size)
+            chosen = candidates[0]
+            for candidate in candidates:
+                box = LabelPlacer.get_box(candidate[0], candidate[1], size)
+                if all(j == i for j in occupied.intersection(box)):
+                    chosen = candidate
+                    break
+
+            px, py, leader = chosen
+            box = LabelPlacer.get_box(px, py, size)
+            occupied.insert(num + i, box)
+            segment = ((x, y), (min(max(x, box[0]), box[2]), min(max(y, box[1]), box[3]))) if leader else None
+            placement[name] = (px, py, segment)
+        return placement
+
+    def place(self, xs, ys, hs, names):
+        """
+        Returns x and y of caption baseline centers, leader segments and flags of captions with leader lines
+        for locations and bar heights of given cities/municipalities, empty name is not shown
+        """
+        shown = [i for i, name in enumerate(names) if name]
+        steps = np.ceil(np.nan_to_num(np.asarray(hs, dtype=np.float64)) / self.HEIGHT_STEP).astype(np.int64)
+        key = frozenset((names[i], steps[i]) for i in shown)
+        placement = self.placements.get(key)
+        if placement is None:
+            placement = self.calc_placement([xs[i] for i in shown], [ys[i] for i in shown],
+                                            [steps[i] * self.HEIGHT_STEP for i in shown], [names[i] for i in shown])
+            self.placements[key] = placement
+            while len(self.placements) > self.MAX_PLACEMENTS:
+                self.placements.popitem(last=False)
+        self.placements.move_to_end(key)
+
+        px = np.array(xs, dtype=np.float64)
+        py = np.array(ys, dtype=np.float64) - self.offset
+        segments = np.zeros((len(names), 2, 2), dtype=np.float64)
+        leaders = np.zeros(len(names), dtype=bool)
+        for i in shown:
+            px[i], py[i], segment = placement[names[i]]
+            if segment is not None:
+                segments[i] = segment
+                leaders[i] = True
+        return px, py, segments, leaders
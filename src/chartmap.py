@@ -4,12 +4,45 @@ import numpy as np
 import pandas as pd
 import matplotlib as mpl
 import matplotlib.cm as cm 
-import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
-import matplotlib.animation as animation
-
+import matplotlib.colorbar
+
+from matplotlib.artist import Artist
+from matplotlib.path import Path
+from matplotlib.patches import PathPatch
+from matplotlib.collections import PolyCollection, LineCollection, PatchCollection
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from mngrdata import DataMngr
+from mngrcache import CacheMngr
+from mngrtrace import TraceMngr
 from chartbase import Chart
+from chartlabel import LabelPlacer
+
+class MapImage(Artist):
+    """
+    Represents rasterized map drawn directly into pixels of the axes
+    """
+
+    def __init__(self, chart):
+        super().__init__()
+        self.chart = chart
+        self.set_zorder(0)
+
+    def draw(self, renderer):
+        """
+        Draw rasterized map of the current size of the axes
+        """
+        if not self.get_visible():
+            return
+        bbox = self.axes.bbox
+        img = self.chart.load_background(int(round(bbox.width)), int(round(bbox.height)))
+        gc = renderer.new_gc()
+        renderer.draw_image(gc, int(round(bbox.x0)), int(round(bbox.y0)), img)
+        gc.restore()
+        self.stale = False
+        return
+
 
 class MapChart(Chart):
     """
@@ -20,17 +53,18 @@ class MapChart(Chart):
     ALPHA = 0.9
     LINE_ALIGN = 0.07
     TEXT_ALIGN = 0.08
+    TEXT_SIZE = 8
     BAR_WIDTH = 0.1
+    COLORS = ['lightblue', 'dodgerblue', 'lightgreen', 'green', 'yellow', 'orange', 'red', 'darkred', 'indigo']
+    BACKGROUND = 'background'
+    BACKGROUNDS = {}        # rasterized maps shared by all map charts of the process
+    ASPECTS = {}            # aspect ratios of maps shared by all map charts of the process
 
     def __init__(self, title, xlabel, ratio, stable, top):
         super().__init__(title, xlabel, ratio, 'darkgrey', 'seaborn-deep', stable, top, 0.7, \
             DataMngr.WIDTH_MAP, DataMngr.HEIGHT_MAP, DataMngr.DPI_MAP)
         self.axes1 = self.fig.add_axes([0.85, 0.16, 0.02, 0.65])  # left, bottom, right, top
 
-        self.curr_pos = None
-        self.curr_xs = None
-        self.curr_ys = None
-
         self.map_plot = None
         self.bounds = None
         self.globalmin = None
@@ -39,6 +73,10 @@ class MapChart(Chart):
         self.localmax = None
 
         self.cbar = None
+        self.scale_changed = None
+        self.to_cache = True        # keep rasterized map also on disk, otherwise only in memory
+        self.declutter = True       # move overlapping captions, with leader lines if they are far from location
+        self.labels = LabelPlacer(MapChart.TEXT_SIZE, MapChart.TEXT_ALIGN, MapChart.LINE_ALIGN, MapChart.BAR_WIDTH)
 
 
     def setup_axes(self):
@@ -79,52 +117,22 @@ class MapChart(Chart):
             val_norm = DataMngr.normalize(val, 0, self.localmax)
         return val_norm
 
-    @classmethod
-    def norm_alpha(cls, alpha):
-        """
-        Check is alpha value in range [0..1]
-        """
-        val = alpha if alpha <= cls.ALPHA else cls.ALPHA
-        norm_val = val if val >= 0.0 else 0.0
-        return norm_val
-
-    @classmethod
-    def set_alpha(cls, obj, alpha, hide=False, disappear=False, val=1):
+    def calc_bounds(self, maxval):
         """
-        Set alpha factor
+        Returns bounds of color map for given maximum, or for each of given maximums
         """
-        if hide:
-            if abs(val) < cls.THRESHOLD:
-                obj.set_alpha(0)
-                return obj
-            else:
-                alpha = cls.norm_alpha(alpha)
-                obj.set_alpha(alpha)
-                return obj
-
-        if disappear:
-            if abs(val) < cls.THRESHOLD:
-                my_alpha = cls.norm_alpha(obj.get_alpha() - alpha)
-                obj.set_alpha(my_alpha)
-                return obj
-            else:
-                my_alpha = cls.norm_alpha(obj.get_alpha() + alpha)
-                obj.set_alpha(my_alpha)
-                return obj
-
-        alpha = cls.norm_alpha(alpha)
-        obj.set_alpha(alpha)
-        return obj
+        maxval = np.asarray(maxval, dtype=np.float64)
+        if not self.ratio:
+            maxval = np.where(maxval < 10, 9, maxval)
+        bounds = np.linspace(0, maxval, len(MapChart.COLORS)+1, axis=-1)
+        return bounds if self.ratio else bounds.astype(int)
 
     def create_cmap(self, maxval):
         """
         Create color map
         """
-        if not self.ratio and maxval < 10:
-            maxval = 9
-        self.cmap = mpl.colors.ListedColormap(['lightblue', 'dodgerblue', 'lightgreen', 'green', 'yellow', 'orange', 'red', 'darkred', 'indigo'])
-        bounds = np.linspace(0, maxval, self.cmap.N+1)
-        self.bounds = bounds if self.ratio else [int(x) for x in bounds]
+        self.cmap = mpl.colors.ListedColormap(MapChart.COLORS)
+        self.bounds = self.calc_bounds(maxval)
         self.norm = mpl.colors.BoundaryNorm(self.bounds, self.cmap.N)
         return
 
@@ -138,31 +146,131 @@ class MapChart(Chart):
             orientation='vertical', format=num_format, drawedges=False)
         self.cbar.outline.set_visible(False)
         self.cbar.ax.set_title(self.xlabel, fontsize=10, y=-MapChart.TEXT_ALIGN, alpha=MapChart.ALPHA)
+        self.invalidate()
         return
 
     def draw_map(self):
         """
-        Plotting map of Serbia
+        Plotting map of Serbia, the map is rasterized once for size, resolution, extent and style of the axes
         """
-        map_data = DataMngr.load_map()
-        map_plot = map_data.plot(color='w', edgecolor='w', ax=self.axes)
+        self.axes.set_aspect(self.load_aspect())
+        map_plot = MapImage(self)
+        self.axes.add_artist(map_plot)
         return map_plot
 
-    def city_bar_plot(self, x, y, val, name, min_city, max_city):
+    @staticmethod
+    def get_map_key():
+        """
+        Returns location, size and modification time of the map file
+        """
+        url_map = os.path.join(DataMngr.MAP_DIR, DataMngr.MAP_FILENAME)
+        stat = os.stat(url_map)
+        return (url_map, stat.st_size, stat.st_mtime_ns)
+
+    def load_aspect(self):
+        """
+        Returns aspect ratio of the map, cached in memory and on disk
+        """
+        map_key = MapChart.get_map_key()
+        aspect = MapChart.ASPECTS.get(map_key)
+        if aspect is None:
+            name = '{}-aspect'.format(MapChart.BACKGROUND)
+            key = CacheMngr.content_key(map_key[0], DataMngr.CACHE_VERSION)
+            aspect = CacheMngr.load(DataMngr.CACHE_DIR, name, key) if self.to_cache else None
+            if aspect is None:
+                aspect = MapChart.calc_aspect(DataMngr.load_map())
+                if self.to_cache:
+                    CacheMngr.save(DataMngr.CACHE_DIR, name, key, aspect)
+            MapChart.ASPECTS[map_key] = aspect
+        return aspect
+
+    def load_background(self, width, height):
+        """
+        Returns rasterized map for given size of the axes in pixels, cached in memory and on disk
+        """
+        extent = self.axes.get_xlim() + self.axes.get_ylim()
+        map_key = MapChart.get_map_key()
+        mem_key = map_key + (width, height, extent, self.style)
+        img = MapChart.BACKGROUNDS.get(mem_key)
+        if img is None:
+            name = '{}-{}x{}'.format(MapChart.BACKGROUND, width, height)
+            key = CacheMngr.content_key(map_key[0], DataMngr.CACHE_VERSION, width, height, extent, self.style)
+            img = CacheMngr.load(DataMngr.CACHE_DIR, name, key) if self.to_cache else None
+            if img is None:
+                img = self.rasterize_map(width, height, extent)
+                if self.to_cache:
+                    CacheMngr.save(DataMngr.CACHE_DIR, name, key, img)
+            MapChart.BACKGROUNDS[mem_key] = img
+        return img
+
+    @staticmethod
+    def calc_aspect(map_data):
+        """
+        Returns aspect ratio of the map, geographical coordinates are scaled by latitude in the middle of the map
+        """
+        if map_data.crs is None or not map_data.crs.is_geographic:
+            return 'equal'
+        bounds = map_data.total_bounds
+        y_coord = np.mean([bounds[1], bounds[3]])
+        return 1 / np.cos(y_coord * np.pi / 180)
+
+    @staticmethod
+    def calc_map_paths(map_data):
+        """
+        Returns paths of all polygons of the map, including their holes
+        """
+        paths = []
+        for geometry in map_data.geometry:
+            polygons = geometry.geoms if hasattr(geometry, 'geoms') else [geometry]
+            for polygon in polygons:
+                rings = [polygon.exterior] + list(polygon.interiors)
+                paths.append(Path.make_compound_path(*[Path(np.asarray(ring.coords)[:, :2]) for ring in rings]))
+        return paths
+
+    def rasterize_map(self, width, height, extent):
+        """
+        Returns RGBA image of map of Serbia with given size in pixels and geographical extent,
+        rows of the image are ordered from bottom to top as expected by the renderer
+        """
+        fig = Figure(figsize=(width / self.dpi, height / self.dpi), dpi=self.dpi, facecolor='none')
+        canvas = FigureCanvasAgg(fig)
+        axes = fig.add_axes([0, 0, 1, 1])
+        axes.set_axis_off()
+        axes.patch.set_alpha(0)
+
+        # Polygons are added directly, plotting through geopandas would redraw the current pyplot figure
+        map_data = DataMngr.load_map()
+        patches = [PathPatch(path) for path in MapChart.calc_map_paths(map_data)]
+        axes.add_collection(PatchCollection(patches, facecolor='w', edgecolor='w'))
+        axes.set_xlim(extent[0], extent[1])
+        axes.set_ylim(extent[2], extent[3])
+
+        canvas.draw()
+        img = np.ascontiguousarray(np.asarray(canvas.buffer_rgba())[::-1])
+        return img
+
+    @staticmethod
+    def calc_verts(xs, ys, hs):
         """
-        Plotting bar chart at geographic coordinates of cities/municipalities
+        Returns vertices of vertical bars with given locations of bottom center and heights
         """
-        # Calculate parameters
-        color = self.get_color(val)
-        val_norm = DataMngr.normalize(val, min_city, max_city)
-        if self.stable:
-            val_norm = DataMngr.normalize(val, self.globalmin, self.globalmax)
+        verts = np.zeros((len(xs), 4, 2), dtype=np.float64)
+        verts[:, [0, 3], 0] = (xs - MapChart.BAR_WIDTH / 2)[:, np.newaxis]
+        verts[:, [1, 2], 0] = (xs + MapChart.BAR_WIDTH / 2)[:, np.newaxis]
+        verts[:, [0, 1], 1] = ys[:, np.newaxis]
+        verts[:, [2, 3], 1] = (ys + hs)[:, np.newaxis]
+        return verts
 
-        # Drawing    
-        self.axes.bar(x=x, bottom=y, height=val_norm, width=MapChart.BAR_WIDTH, lw=0.3, color=color, edgecolor='black', align='center', alpha=MapChart.ALPHA)
-        self.axes.plot([x - MapChart.LINE_ALIGN, x + MapChart.LINE_ALIGN], [y, y], ls='-', lw=0.5, color='black', alpha=MapChart.ALPHA)
-        self.axes.text(x, y - MapChart.TEXT_ALIGN, name, ha='center', color='black', fontsize=8, alpha=MapChart.ALPHA)
-        return
+    @staticmethod
+    def calc_segments(xs, ys):
+        """
+        Returns segments of baselines of bars with given locations of bottom center
+        """
+        segments = np.zeros((len(xs), 2, 2), dtype=np.float64)
+        segments[:, 0, 0] = xs - MapChart.LINE_ALIGN
+        segments[:, 1, 0] = xs + MapChart.LINE_ALIGN
+        segments[:, :, 1] = ys[:, np.newaxis]
+        return segments
 
     def draw_img(self, data, target_col):
         """
@@ -179,17 +287,36 @@ class MapChart(Chart):
             self.axes.text(0, -0.06, news_txt, ha='left', color='black', transform=self.axes.transAxes, fontsize=10, wrap=True, \
                 bbox=dict(facecolor='floralwhite', edgecolor='moccasin', boxstyle='round'))
 
-        # Make vertical bar plot for each city
+        # Calculate parameters
         max_city = data[target_col].max()
         min_city = data[target_col].min()
-        for day, city in data.iterrows():
-            if city[target_col] > MapChart.THRESHOLD:
-                self.city_bar_plot(x=city[DataMngr.LONGITUDE], 
-                                    y=city[DataMngr.LATITUDE], 
-                                    val=city[target_col], 
-                                    name=city[DataMngr.CITY],
-                                    min_city=min_city,
-                                    max_city=max_city)
+        cities = data[data[target_col] > MapChart.THRESHOLD]
+        xs = cities[DataMngr.LONGITUDE].values.astype(np.float64)
+        ys = cities[DataMngr.LATITUDE].values.astype(np.float64)
+        vals = cities[target_col].values.astype(np.float64)
+        colors = self.get_color(vals)
+        if self.stable:
+            hs = DataMngr.normalize(vals, self.globalmin, self.globalmax)
+        else:
+            hs = DataMngr.normalize(vals, min_city, max_city)
+
+        # Make vertical bar plot for all cities at once
+        bars = PolyCollection(MapChart.calc_verts(xs, ys, hs), facecolors=colors, edgecolors='black', linewidths=0.3, alpha=MapChart.ALPHA)
+        self.axes.add_collection(bars, autolim=False)
+        lines = LineCollection(MapChart.calc_segments(xs, ys), colors='black', linestyles='-', linewidths=0.5, alpha=MapChart.ALPHA)
+        self.axes.add_collection(lines, autolim=False)
+
+        # Captions
+        names = cities[DataMngr.CITY].values
+        if self.declutter:
+            self.labels.set_scale(self.axes)
+            text_xs, text_ys, segments, leaders = self.labels.place(xs, ys, hs, names)
+            leader_lines = LineCollection(segments[leaders], colors='black', linewidths=0.3, alpha=MapChart.ALPHA)
+            self.axes.add_collection(leader_lines, autolim=False)
+        else:
+            text_xs, text_ys = xs, ys - MapChart.TEXT_ALIGN
+        for x, y, name in zip(text_xs, text_ys, names):
+            self.axes.text(x, y, name, ha='center', color='black', fontsize=MapChart.TEXT_SIZE, alpha=MapChart.ALPHA)
         return
     
 
@@ -200,297 +327,130 @@ class MapChart(Chart):
         # Set axis
         self.setup_axes()
         self.draw_map()
+        self.labels.set_scale(self.axes)
 
         # Data objects
-        self.curr_cities = np.array([''] * self.top)
-        self.curr_sizes = np.array(([0] * self.top), dtype=np.float64)
-        self.curr_pos = np.arange(0, self.top, 1, dtype=np.int64)
-
-        self.curr_xs = np.array(([0] * self.top), dtype=np.float64)
-        self.curr_ys = np.array(([0] * self.top), dtype=np.float64)
+        xs = np.zeros(self.top, dtype=np.float64)
+        ys = np.zeros(self.top, dtype=np.float64)
+        hs = np.zeros(self.top, dtype=np.float64)
 
         # Artist objects
-        self.bars = np.array(
-            self.axes.bar(x=self.curr_xs, bottom=self.curr_ys, height=self.curr_sizes, \
-                width=MapChart.BAR_WIDTH, lw=0.3, edgecolor='black', align='center', alpha=MapChart.ALPHA))
+        # Colors and transparency of bars and lines are set for each bar in every frame
+        self.bars = PolyCollection(MapChart.calc_verts(xs, ys, hs), facecolors='none', edgecolors='none', linewidths=0.3)
+        self.axes.add_collection(self.bars, autolim=False)
+
+        self.lines = LineCollection(MapChart.calc_segments(xs, ys), colors='none', linestyles='-', linewidths=0.5)
+        self.axes.add_collection(self.lines, autolim=False)
 
-        self.lines = np.array(
-            [self.axes.plot([x - MapChart.LINE_ALIGN, x + MapChart.LINE_ALIGN], [y, y], ls='-', lw=0.5, color='black', alpha=MapChart.ALPHA) \
-                for x, y in zip(self.curr_xs, self.curr_ys)]).flatten()
+        self.leaders = LineCollection(np.zeros((self.top, 2, 2), dtype=np.float64), colors='none', linestyles='-', linewidths=0.3)
+        self.axes.add_collection(self.leaders, autolim=False)
 
         self.cities = np.array(
-            [self.axes.text(x, y - MapChart.TEXT_ALIGN, '', ha='center', color='black', fontsize=8, alpha=MapChart.ALPHA) \
-                for x, y in zip(self.curr_xs, self.curr_ys)])
+            [self.axes.text(x, y - MapChart.TEXT_ALIGN, '', ha='center', color='black', fontsize=MapChart.TEXT_SIZE, alpha=MapChart.ALPHA) \
+                for x, y in zip(xs, ys)])
         
         self.date = self.axes.text(0.96, 0.85, '', ha='right', transform=self.axes.transAxes, fontsize=32, alpha=0.5)
         self.news = self.axes.text(0, -0.06, '', ha='left', color='black', transform=self.axes.transAxes, fontsize=10, wrap=True, \
             bbox=dict(facecolor='floralwhite', edgecolor='moccasin', boxstyle='round'))
         self.create_cbar()
 
-        changed = [bar for bar in self.bars] + [line for line in self.lines] + [city for city in self.cities] + [self.date] + [self.news]
+        changed = [self.bars] + [self.lines] + [self.leaders] + [city for city in self.cities] + [self.date] + [self.news]
         return changed
 
-    def update_existing_cities(self, i_frame):
+    def apply_frame(self, xs, ys, hs, alphas, names):
         """
-        Update visibility and value of existing cities
+        Apply locations, heights, transparency and names to all bars
         """
-        # Artist
-        exist_pos_art = np.argwhere(self.curr_pos != -1).flatten()
-        if len(exist_pos_art) <= 0:
-            return
-
-        exist_bars = self.bars[exist_pos_art]
-        exist_lines = self.lines[exist_pos_art]
-        exist_cities_txt = self.cities[exist_pos_art]
-
-        # Data
-        exist_pos = exist_pos_art
-        exist_cities_names = self.prev_cities[exist_pos]
-        
-        h_step = (self.curr_sizes[self.curr_pos[exist_pos]] - self.prev_sizes[exist_pos]) / (self.date_frames - 1)
-        heights = self.prev_sizes[exist_pos] + (h_step * i_frame)
-
-        alpha_step = MapChart.ALPHA / (self.date_frames / 3 - 1)
-
-        for i, (bar, line, city_txt) in enumerate(zip(exist_bars, exist_lines, exist_cities_txt)):
-            height = heights[i]
+        heights = self.normalize(hs)
+        colors = self.get_color(hs)
+        colors[:, 3] = alphas
+        line_colors = np.zeros((len(alphas), 4), dtype=np.float64)
+        line_colors[:, 3] = alphas
 
-            if not self.stable and self.localmax < height:
-                self.localmax = height
-                self.create_cmap(self.localmax)
-                self.create_cbar()
+        # Bars and lines
+        self.bars.set_verts(MapChart.calc_verts(xs, ys, heights))
+        self.bars.set_facecolor(colors)
+        self.bars.set_edgecolor(colors)
+        self.lines.set_segments(MapChart.calc_segments(xs, ys))
+        self.lines.set_color(line_colors)
 
-            color = self.get_color(height)
-            bar.set_color(color)
-
-            val_norm = self.normalize(height)
-            bar.set_height(val_norm)
-
-            alpha = alpha_step * i_frame
-            curr_height_norm = self.normalize(self.curr_sizes[self.curr_pos[exist_pos]][i])
-            MapChart.set_alpha(bar, alpha, disappear=True, val=curr_height_norm)
-            MapChart.set_alpha(line, alpha, disappear=True, val=curr_height_norm)
-            MapChart.set_alpha(city_txt, alpha, disappear=True, val=curr_height_norm)
-
-        # Clean possible decimal errors
-        if i_frame == self.date_frames - 1:
-            for i, (bar, line, city_txt) in enumerate(zip(exist_bars, exist_lines, exist_cities_txt)):
-                height = self.curr_sizes[self.curr_pos[exist_pos]][i]
-                val_norm = self.normalize(height)
-                bar.set_height(val_norm)
-        return
-
-    def update_new_cities(self, i_frame):
-        """
-        Update visibility and value of new cities
-        """
-        # Artist
-        new_pos_art = np.argwhere(self.curr_pos == -1).flatten()
-        if len(new_pos_art) <= 0:
-            return
-
-        new_bars = self.bars[new_pos_art]
-        new_lines = self.lines[new_pos_art]
-        new_cities_txt = self.cities[new_pos_art]
-        
-        # Data
-        new_pos = np.setdiff1d(np.arange(0, self.top, 1), self.curr_pos)
-        new_cities_names = self.curr_cities[new_pos]
-        new_xs = self.curr_xs[new_pos]
-        new_ys = self.curr_ys[new_pos]
-
-        h_step = (self.curr_sizes[new_pos] - (0)) / (2 * self.date_frames / 3 - 1)
-        i_frame_p2 = (i_frame - self.date_frames // 3) % (2 * self.date_frames // 3)
-        heights = 0 + (h_step * i_frame_p2)
-
-        alpha_step = MapChart.ALPHA / (self.date_frames / 3 - 1)
-
-        for i, (bar, line, city_txt) in enumerate(zip(new_bars, new_lines, new_cities_txt)):
-            # Bar
-            x = new_xs[i] - MapChart.BAR_WIDTH / 2
-            bar.set_x(x) 
-            y = new_ys[i]
-            bar.set_y(y)
-
-            height = heights[i]
-
-            if not self.stable and self.localmax < height:
-                self.localmax = height
-                self.create_cmap(self.localmax)
-                self.create_cbar()
-
-            color = self.get_color(height)
-            bar.set_color(color)
-            val_norm = self.normalize(height)
-            bar.set_height(val_norm)
-
-            # Line
-            x1 = new_xs[i] - MapChart.LINE_ALIGN
-            x2 = new_xs[i] + MapChart.LINE_ALIGN
-            line.set_xdata([x1, x2])
-            y1 = new_ys[i]
-            y2 = new_ys[i]
-            line.set_ydata([y1, y2])
-
-            # Captions
-            city_name = new_cities_names[i]
-            city_txt.set_text(city_name)
-
-            xt = new_xs[i]
-            city_txt.set_x(xt)
-            yt = new_ys[i] - MapChart.TEXT_ALIGN
-            city_txt.set_y(yt)
-
-            # Alpha
-            alpha = alpha_step * i_frame_p2
-            curr_height_norm = self.normalize(self.curr_sizes[new_pos][i])
-            MapChart.set_alpha(bar, alpha, hide=True, val=curr_height_norm)
-            MapChart.set_alpha(line, alpha, hide=True, val=curr_height_norm)
-            MapChart.set_alpha(city_txt, alpha, hide=True, val=curr_height_norm)
-
-        # Clean possible decimal errors
-        if i_frame == self.date_frames - 1:
-            for i, (bar, line, city_txt) in enumerate(zip(new_bars, new_lines, new_cities_txt)):
-                # Size
-                height = self.curr_sizes[new_pos][i]
-                val_norm = self.normalize(height)  
-                bar.set_height(val_norm)
-                # Alpha
-                MapChart.set_alpha(bar, MapChart.ALPHA, hide=True, val=val_norm)
-                MapChart.set_alpha(line, MapChart.ALPHA, hide=True, val=val_norm)
-                MapChart.set_alpha(city_txt, MapChart.ALPHA, hide=True, val=val_norm)
+        # Captions, placement is reused while the same cities/municipalities are shown
+        if self.declutter:
+            text_xs, text_ys, segments, leaders = self.labels.place(xs, ys, heights, names)
+        else:
+            text_xs, text_ys = xs, ys - MapChart.TEXT_ALIGN
+            segments = np.zeros((len(xs), 2, 2), dtype=np.float64)
+            leaders = np.zeros(len(xs), dtype=bool)
+        leader_colors = np.zeros((len(alphas), 4), dtype=np.float64)
+        leader_colors[:, 3] = np.where(leaders, alphas, 0)
+        self.leaders.set_segments(segments)
+        self.leaders.set_color(leader_colors)
+
+        for city_txt, name, x, y, alpha in zip(self.cities, names, text_xs, text_ys, alphas):
+            city_txt.set_text(name)
+            city_txt.set_position((x, y))
+            city_txt.set_alpha(alpha)
         return
 
-    def update_old_cities(self, i_frame):
+    def update_scale(self, i_frame, timeline):
         """
-        Update visibility of old cities
+        Update color map from precomputed scale, the color bar is created again only when its bounds are changed
         """
-        # Artist
-        old_pos_art = np.argwhere(self.curr_pos == -1).flatten()
-        if len(old_pos_art) <= 0:
+        if self.stable:
             return
-
-        old_bars = self.bars[old_pos_art]
-        old_lines = self.lines[old_pos_art]
-        old_cities_txt = self.cities[old_pos_art]
-
-        # Data
-        alpha_step = -MapChart.ALPHA / (self.date_frames / 3 - 1)
-
-        for bar, line, text in zip(old_bars, old_lines, old_cities_txt):
-            alpha = bar.get_alpha() + alpha_step * i_frame
-            MapChart.set_alpha(bar, alpha)
-            MapChart.set_alpha(line, alpha)
-            MapChart.set_alpha(text, alpha)
-
-        # Clean possible decimal errors
-        if i_frame == self.date_frames // 3:
-            for bar, line, text in zip(old_bars, old_lines, old_cities_txt):
-                MapChart.set_alpha(bar, 0)
-                MapChart.set_alpha(line, 0)
-                MapChart.set_alpha(text, 0)
+        if i_frame == 0:
+            bounds = self.calc_bounds(timeline.scale)
+            self.scale_changed = np.concatenate(([True], (bounds[1:] != bounds[:-1]).any(axis=1)))
+
+        local_max = timeline.scale[i_frame]
+        if local_max != self.localmax:
+            self.set_local_extremes(timeline.day_min[0], local_max)
+            self.create_cmap(local_max)
+        if self.scale_changed[i_frame]:
+            self.create_cbar()
         return
 
-    def update_values(self, i_frame):
+    def update_values(self, i_frame, timeline):
         """
-        Update values of bars
+        Update values of bars from compiled timeline
         """
-        i_frame = i_frame % self.date_frames
-        self.update_existing_cities(i_frame)
-
-        if i_frame < self.date_frames // 3:
-            self.update_old_cities(i_frame)
-        else:
-            self.update_new_cities(i_frame)
+        self.apply_frame(timeline.xs[i_frame], timeline.ys[i_frame], timeline.hs[i_frame], timeline.alphas[i_frame], \
+            timeline.names[timeline.ids[i_frame]])
 
-        changed = [bar for bar in self.bars] + [line for line in self.lines] + [city for city in self.cities]
+        changed = [self.bars] + [self.lines] + [self.leaders] + [city for city in self.cities]
         return changed
 
-    def calc_positions_change(self, prev_cities, curr_cities):
-        """
-        Calculating positions change between previous and current cities list
-        Returns new positions for common cities
+    def draw_anim(self, i_frame, timeline):
         """
-        for i, city in enumerate(prev_cities):
-            ind = np.argwhere(city == curr_cities).flatten()
-            self.curr_pos[i] = ind[0] if len(ind) > 0 else -1
-        return
-
-    def draw_anim(self, i_frame, data, target_col):
-        """
-        Drawing animation of map chart for the target column by cities/municipalities
+        Drawing animation of map chart from compiled timeline of the target column by cities/municipalities
         """
         # New day
         if i_frame % self.date_frames == 0:
-
-            # Update artists
-            new_pos_art = np.argwhere(self.curr_pos == -1).flatten()
-            new_pos = np.setdiff1d(np.arange(0, self.top, 1), self.curr_pos)
-            exist_pos_art = np.argwhere(self.curr_pos != -1).flatten()
-            exist_pos = self.curr_pos[exist_pos_art]
-            old_pos = np.concatenate((exist_pos_art, new_pos_art), axis=None)
-            now_pos = np.concatenate((exist_pos, new_pos), axis=None)
-
-            bars = [''] * self.top
-            cities = [''] * self.top
-            lines = [''] * self.top
-            for i, npos in enumerate(now_pos):
-                bars[npos] = self.bars[old_pos][i]
-                cities[npos] = self.cities[old_pos][i]
-                lines[npos] = self.lines[old_pos][i]
-
-            self.bars = np.array(bars)
-            self.cities = np.array(cities)
-            self.lines = np.array(lines)
-
-            # Update previous data
-            self.prev_cities = self.curr_cities.copy()
-            self.prev_sizes = self.curr_sizes.copy()
-
-            # Calculate for new day
             ind_day = i_frame // self.date_frames
-            day = list(data.groups.keys())[ind_day]
-            data = data.get_group(day)
-            self.curr_cities = np.array(data[DataMngr.CITY].reset_index(drop=True).values)
-            self.curr_sizes = np.array(data[target_col].reset_index(drop=True).values)
-            self.curr_xs = np.array(data[DataMngr.LONGITUDE].reset_index(drop=True).values)
-            self.curr_ys = np.array(data[DataMngr.LATITUDE].reset_index(drop=True).values)
-            self.calc_positions_change(self.prev_cities, self.curr_cities)
+            day = timeline.days[ind_day]
 
             # Artist
             day_str = DataMngr.date_to_str(day)
             self.date.set_text(day_str)
-
-            if day in self.the_news.index:
-                curr_news = self.the_news[day].split('.')
-                lines = '.\n'.join(curr_news).strip()
-                news_txt = '{}\n {}'.format(day_str, lines)
-                self.news.set_text(news_txt)
-                self.duration = Chart.NEWS_TIME
-            elif self.duration == 0:
-                self.news.set_text('')
-                self.duration = Chart.NEWS_TIME
-            else:
-                self.duration -= 1
+            self.update_news(day, day_str)
 
             # Info
-            print(day_str)
-            for i, city in enumerate(zip(self.curr_cities, self.curr_sizes)):
-                print(i, city)
-            print()
-
-            # Update axes for first day
-            if not self.stable and i_frame == 0:
-                minval = data[target_col].min()
-                maxval = data[target_col].max()
-                self.set_local_extremes(minval, maxval)
-                self.create_cmap(maxval)
-                self.create_cbar()
+            if self.verbose:
+                with TraceMngr.span('MapChart.info', 'frame'):
+                    print(day_str)
+                    curr_cities = timeline.names[timeline.day_ids[ind_day]]
+                    curr_sizes = timeline.day_values[ind_day]
+                    for i, city in enumerate(zip(curr_cities, curr_sizes)):
+                        print(i, city)
+                    print()
 
         # Update 
-        val_changed = self.update_values(i_frame)
-        self.fig.canvas.draw()
-        self.fig.canvas.flush_events()
+        with TraceMngr.span('MapChart.update_scale', 'frame'):
+            self.update_scale(i_frame, timeline)
+        with TraceMngr.span('MapChart.update_values', 'frame'):
+            val_changed = self.update_values(i_frame, timeline)
+        if self.live:
+            self.blit_frame()
 
         changed = val_changed + [self.date] + [self.news]
         return changed
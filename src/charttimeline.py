@@ -0,0 +1,329 @@
+
+import numpy as np
+import pandas as pd
+
+from abc import ABC, abstractmethod
+from mngrdata import DataMngr
+from mngrtrace import TraceMngr
+
+
+class TransitionPlanner:
+    """
+    Plans transitions of ranked cities/municipalities between all adjacent days at once
+    """
+
+    def __init__(self, top, empty):
+        self.top = top
+        self.empty = empty
+        self.counts = None
+        self.ids = None
+        self.dest = None
+        self.stay = None
+        self.exit = None
+        self.enter = None
+        self.pos_map = None
+
+    def plan(self, day_ids):
+        """
+        Plan transitions from the previous into the current day for every day, where the day 
+        before the first one is empty. For each previous position calculates new position of 
+        the same city (-1 if the city leaves), stay/exit/enter sets and mapping of every 
+        previous position into new one, where freed positions take entered positions in order
+        """
+        num_days = len(day_ids)
+        top = self.top
+        self.counts = np.array([len(ids) for ids in day_ids], dtype=np.int64)
+        num_names = max([ids.max() for ids in day_ids if len(ids) > 0], default=self.empty) + 1
+
+        # Name ids by position for each day
+        rows = np.repeat(np.arange(0, num_days, 1), self.counts)
+        cols = np.arange(0, self.counts.sum(), 1) - np.repeat(np.cumsum(self.counts) - self.counts, self.counts)
+        self.ids = np.full((num_days, top), self.empty, dtype=np.int64)
+        self.ids[rows, cols] = np.concatenate(day_ids) if num_days > 0 else []
+
+        # Position of each name for each day
+        ranks = np.full((num_days, num_names), -1, dtype=np.int64)
+        ranks[rows, self.ids[rows, cols]] = cols
+        ranks[:, self.empty] = -1
+
+        # New position for each previous position
+        prev_ids = np.vstack((np.full((1, top), self.empty, dtype=np.int64), self.ids[:-1]))
+        days = np.arange(0, num_days, 1)[:, np.newaxis]
+        self.dest = ranks[days, prev_ids]
+        self.stay = self.dest >= 0
+
+        prev_counts = np.concatenate(([0], self.counts[:-1]))
+        positions = np.arange(0, top, 1)[np.newaxis, :]
+        self.exit = (~self.stay) & (positions < prev_counts[:, np.newaxis])
+
+        claimed = np.zeros((num_days, top), dtype=bool)
+        stay_days, stay_pos = np.nonzero(self.stay)
+        claimed[stay_days, self.dest[stay_days, stay_pos]] = True
+        self.enter = (~claimed) & (positions < self.counts[:, np.newaxis])
+
+        # Freed positions take free positions in ascending order
+        free_src = np.argsort(self.stay, axis=1, kind='mergesort')
+        free_dst = np.argsort(claimed, axis=1, kind='mergesort')
+        free = positions < (top - self.stay.sum(axis=1))[:, np.newaxis]
+        free_days = np.broadcast_to(days, (num_days, top))[free]
+        self.pos_map = self.dest.copy()
+        self.pos_map[free_days, free_src[free]] = free_dst[free]
+        return self
+
+
+class Timeline(ABC):
+    """
+    Represents animation compiled once from ranked data into dense frame x slot arrays,
+    subclasses compile arrays of their chart type
+    """
+
+    EMPTY = 0       # name id of the slot without city/municipality
+
+    def __init__(self, top, date_frames):
+        self.top = top
+        self.date_frames = date_frames
+        self.total_frames = 0
+        # Days
+        self.days = []
+        self.day_ids = []
+        self.day_values = []
+        self.day_min = None
+        self.day_max = None
+        # Names
+        self.names = None
+        self.planner = None
+        # Scale
+        self.scale = None
+
+    @property
+    def num_days(self):
+        """
+        Returns number of days in timeline
+        """
+        return len(self.days)
+
+    def split_days(self, ranks, cols=()):
+        """
+        Split top cities/municipalities of rank index into arrays of name ids, values 
+        and given columns of the matrix store for each day
+        Returns list of arrays of given columns for each day
+        """
+        store = ranks.store
+        slices = [ranks.top_slice(self.top, ind_day) for ind_day in range(len(ranks.days))]
+        self.days = list(ranks.days)
+        self.names = np.concatenate([[''], store.cities])
+
+        self.day_ids = [ranks.city_codes[day_slice] + 1 for day_slice in slices]
+        self.day_values = [ranks.values[day_slice] for day_slice in slices]
+        self.day_min = np.array([values.min() if len(values) > 0 else 0 for values in self.day_values])
+        self.day_max = np.array([values.max() if len(values) > 0 else 0 for values in self.day_values])
+        self.total_frames = self.num_days * self.date_frames
+        self.planner = TransitionPlanner(self.top, Timeline.EMPTY).plan(self.day_ids)
+
+        matrices = [store.matrix(col) for col in cols]
+        columns = [[matrix[day_row, ids - 1] for day_row, ids in zip(ranks.day_rows, self.day_ids)] for matrix in matrices]
+        return columns
+
+    def plan_day(self, ind_day, slot_pos):
+        """
+        Returns new position for existing slots (-1 otherwise) and target position for each slot
+        """
+        dest = self.planner.dest[ind_day][slot_pos]
+        target = self.planner.pos_map[ind_day][slot_pos]
+        return dest, target
+
+    def calc_scale(self, sizes):
+        """
+        Returns maximum of the scale for every frame in non-stable mode, 
+        the scale starts at maximum of the first day and grows with sizes of bars
+        """
+        if self.total_frames == 0:
+            return np.zeros(0, dtype=np.float64)
+        frame_max = sizes.max(axis=1) if sizes.shape[1] > 0 else np.zeros(self.total_frames, dtype=np.float64)
+        scale = np.maximum.accumulate(np.maximum(frame_max, self.day_max[0]))
+        return scale
+
+    @abstractmethod
+    def compile(self, ranks):
+        """
+        Compile timeline of top cities/municipalities from rank index of the target column
+        Returns the timeline
+        """
+
+
+class BarhTimeline(Timeline):
+    """
+    Timeline of horizontal bar chart race with position, width, name and colour of each bar in every frame,
+    colour follows the city/municipality while it stays in the top and an entering one takes the colour of the leaving one
+    """
+
+    def __init__(self, top, date_frames):
+        super().__init__(top, date_frames)
+        self.ys = None
+        self.ws = None
+        self.ids = None
+        self.cids = None
+
+    @TraceMngr.traced('plot')
+    def compile(self, ranks):
+        """
+        Compile positions, widths, names and colour indexes of bars for every frame from rank index of the target column
+        """
+        self.split_days(ranks)
+        F = self.date_frames
+        self.ys = np.zeros((self.total_frames, self.top), dtype=np.float64)
+        self.ws = np.zeros((self.total_frames, self.top), dtype=np.float64)
+        self.ids = np.zeros((self.total_frames, self.top), dtype=np.int64)
+        self.cids = np.zeros((self.total_frames, self.top), dtype=np.int64)
+
+        # Interpolation factors for frames within the day
+        frames = np.arange(0, F, 1)[:, np.newaxis]
+        half_frames = F // 2
+        first_half = frames < half_frames
+        t_full = frames / (F - 1)
+        t_half = np.where(first_half, frames, frames % half_frames) / (F / 2 - 1)
+
+        # Slots state at the beginning of the day
+        slot_pos = np.arange(0, self.top, 1, dtype=np.int64)
+        slot_id = np.full(self.top, Timeline.EMPTY, dtype=np.int64)
+        slot_size = np.zeros(self.top, dtype=np.float64)
+        slot_cid = np.arange(0, self.top, 1, dtype=np.int64)
+
+        for ind_day, (curr_ids, curr_sizes) in enumerate(zip(self.day_ids, self.day_values)):
+            dest, target = self.plan_day(ind_day, slot_pos)
+            exist = dest >= 0
+            new = (~exist) & (target < len(curr_ids))
+            target_size = np.zeros(self.top, dtype=np.float64)
+            target_size[exist | new] = curr_sizes[target[exist | new]]
+            target_id = np.full(self.top, Timeline.EMPTY, dtype=np.int64)
+            target_id[exist | new] = curr_ids[target[exist | new]]
+
+            # Existing cities move and grow during the whole day, old cities leave
+            # in the first half and new cities enter in the second half of the day
+            ys_exist = slot_pos + (target - slot_pos) * t_full
+            ys_old = slot_pos + (-1 - slot_pos) * t_half
+            ys_new = -1 + (target + 1) * t_half
+            ys = np.where(exist, ys_exist, np.where(first_half, ys_old, ys_new))
+
+            ws_exist = slot_size + (target_size - slot_size) * t_full
+            ws_new = target_size * t_half
+            ws = np.where(exist, ws_exist, np.where(first_half, slot_size, ws_new))
+
+            ids = np.where(exist | first_half, slot_id, target_id)
+
+            # Clean possible decimal errors
+            ys[-1] = target
+            ws[-1] = target_size
+
+            frames_day = slice(ind_day * F, (ind_day + 1) * F)
+            self.ys[frames_day] = ys
+            self.ws[frames_day] = ws
+            self.ids[frames_day] = ids
+            self.cids[frames_day] = slot_cid
+
+            slot_pos = target
+            slot_id = target_id
+            slot_size = target_size
+
+        self.scale = self.calc_scale(self.ws)
+        return self
+
+
+class MapTimeline(Timeline):
+    """
+    Timeline of map chart with location, height, transparency and name of each bar in every frame
+    """
+
+    def __init__(self, top, date_frames, alpha, threshold):
+        super().__init__(top, date_frames)
+        self.alpha = alpha
+        self.threshold = threshold
+        self.xs = None
+        self.ys = None
+        self.hs = None
+        self.alphas = None
+        self.ids = None
+
+    @TraceMngr.traced('plot')
+    def compile(self, ranks):
+        """
+        Compile locations, heights, transparency and names of bars for every frame from rank index of the target column
+        """
+        day_xs, day_ys = self.split_days(ranks, cols=(DataMngr.LONGITUDE, DataMngr.LATITUDE))
+        F = self.date_frames
+        shape = (self.total_frames, self.top)
+        self.xs = np.zeros(shape, dtype=np.float64)
+        self.ys = np.zeros(shape, dtype=np.float64)
+        self.hs = np.zeros(shape, dtype=np.float64)
+        self.alphas = np.zeros(shape, dtype=np.float64)
+        self.ids = np.zeros(shape, dtype=np.int64)
+
+        # Interpolation factors for frames within the day
+        frames = np.arange(0, F, 1)[:, np.newaxis]
+        third_frames = F // 3
+        first_third = frames < third_frames
+        t_full = frames / (F - 1)
+        frames_p2 = (frames - third_frames) % (2 * F // 3)
+        t_p2 = frames_p2 / (2 * F / 3 - 1)
+        alpha_step = self.alpha / (F / 3 - 1)
+        alpha_ramp = alpha_step * frames * (frames + 1) / 2          # accumulated change of transparency
+
+        # Slots state at the beginning of the day
+        slot_pos = np.arange(0, self.top, 1, dtype=np.int64)
+        slot_id = np.full(self.top, Timeline.EMPTY, dtype=np.int64)
+        slot_size = np.zeros(self.top, dtype=np.float64)
+        slot_x = np.zeros(self.top, dtype=np.float64)
+        slot_y = np.zeros(self.top, dtype=np.float64)
+        slot_alpha = np.full(self.top, self.alpha, dtype=np.float64)
+
+        for ind_day, (curr_ids, curr_sizes, curr_xs, curr_ys) in enumerate(zip(self.day_ids, self.day_values, day_xs, day_ys)):
+            dest, target = self.plan_day(ind_day, slot_pos)
+            exist = dest >= 0
+            new = (~exist) & (target < len(curr_ids))
+            shown = exist | new
+            target_size = np.zeros(self.top, dtype=np.float64)
+            target_size[shown] = curr_sizes[target[shown]]
+            target_id = np.full(self.top, Timeline.EMPTY, dtype=np.int64)
+            target_id[shown] = curr_ids[target[shown]]
+            target_x = slot_x.copy()
+            target_x[shown] = curr_xs[target[shown]]
+            target_y = slot_y.copy()
+            target_y[shown] = curr_ys[target[shown]]
+            visible = np.abs(target_size) >= self.threshold
+
+            # Existing cities grow and appear/disappear during the whole day, old cities
+            # disappear in the first third and new cities appear in the rest of the day
+            hs_exist = slot_size + (target_size - slot_size) * t_full
+            hs = np.where(exist, hs_exist, np.where(first_third, slot_size, target_size * t_p2))
+
+            alphas_exist = slot_alpha + np.where(visible, alpha_ramp, -alpha_ramp)
+            alphas_old = slot_alpha - alpha_ramp
+            alphas_new = np.where(visible, alpha_step * frames_p2, 0)
+            alphas = np.where(exist, alphas_exist, np.where(first_third, alphas_old, alphas_new))
+            alphas = np.clip(alphas, 0, self.alpha)
+
+            moved = first_third | exist
+            xs = np.where(moved, slot_x, target_x)
+            ys = np.where(moved, slot_y, target_y)
+            ids = np.where(moved, slot_id, target_id)
+
+            # Clean possible decimal errors
+            hs[-1] = target_size
+            alphas[-1] = np.where(exist, alphas[-1], np.where(new & visible, self.alpha, 0))
+
+            frames_day = slice(ind_day * F, (ind_day + 1) * F)
+            self.xs[frames_day] = xs
+            self.ys[frames_day] = ys
+            self.hs[frames_day] = hs
+            self.alphas[frames_day] = alphas
+            self.ids[frames_day] = ids
+
+            slot_pos = target
+            slot_id = target_id
+            slot_size = target_size
+            slot_x = target_x
+            slot_y = target_y
+            slot_alpha = alphas[-1]
+
+        self.scale = self.calc_scale(self.hs)
+        return self
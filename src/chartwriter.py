@@ -0,0 +1,101 @@
+
+import time
+import subprocess
+import matplotlib as mpl
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from mngrtrace import TraceMngr
+
+
+class PipeWriter:
+    """
+    Streams raw RGBA buffer of the figure canvas into single long-lived ffmpeg process
+    """
+
+    PIX_FMT_IN = 'rgba'
+    PIX_FMT_OUT = 'yuv420p'
+    CODEC = 'libx264'
+
+    def __init__(self, fig, url, fps, codec=CODEC):
+        self.fig = fig
+        self.url = url
+        self.fps = fps
+        self.codec = codec
+        self.canvas = None
+        self.proc = None
+        self.num_frames = 0
+        self.start_time = None
+        self.elapsed = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.finish(exc_type is None)
+        return False
+
+    @property
+    def achieved_fps(self):
+        """
+        Returns number of frames encoded per second of wall time
+        """
+        elapsed = self.elapsed if self.elapsed is not None else time.perf_counter() - self.start_time
+        return self.num_frames / elapsed if elapsed > 0 else 0.0
+
+    def start(self):
+        """
+        Start ffmpeg process reading raw frames of the canvas size from standard input
+        """
+        self.canvas = self.fig.canvas
+        if not hasattr(self.canvas, 'buffer_rgba'):
+            self.canvas = FigureCanvasAgg(self.fig)
+        self.canvas.draw()
+        height, width = self.canvas.buffer_rgba().shape[:2]
+
+        command = [mpl.rcParams['animation.ffmpeg_path'], '-y', '-loglevel', 'error', \
+            '-f', 'rawvideo', '-vcodec', 'rawvideo', '-pix_fmt', PipeWriter.PIX_FMT_IN, '-s', '{}x{}'.format(width, height), \
+            '-r', str(self.fps), '-i', '-', \
+            '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-vcodec', self.codec, '-pix_fmt', PipeWriter.PIX_FMT_OUT, self.url]
+        self.proc = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.num_frames = 0
+        self.start_time = time.perf_counter()
+        self.elapsed = None
+        return
+
+    def grab_frame(self):
+        """
+        Draw the canvas and write its buffer into the pipe without intermediate copies
+        """
+        with TraceMngr.span('canvas.draw', 'frame'):
+            self.canvas.draw()
+        try:
+            with TraceMngr.span('ffmpeg.write', 'frame'):
+                self.proc.stdin.write(self.canvas.buffer_rgba())
+        except BrokenPipeError:
+            self.finish(False)
+            raise
+        self.num_frames += 1
+        return
+
+    @TraceMngr.traced('encode')
+    def finish(self, check=True):
+        """
+        Close the pipe and wait for ffmpeg to finish encoding
+        """
+        if self.proc is None:
+            return
+        proc = self.proc
+        self.proc = None
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        errors = proc.stderr.read().decode('utf-8', errors='replace')
+        proc.stderr.close()
+        returncode = proc.wait()
+        self.elapsed = time.perf_counter() - self.start_time
+
+        if check and returncode != 0:
+            raise RuntimeError('ffmpeg failed with code {}:\n{}'.format(returncode, errors))
+        return
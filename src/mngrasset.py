@@ -0,0 +1,54 @@
+import os
+
+from collections import OrderedDict
+
+
+class AssetMngr:
+    """
+    Bounded process-wide cache of assets loaded from files
+    """
+
+    MAX_ASSETS = 32
+    assets = OrderedDict()      # key -> (file stamp, asset), least recently used first
+
+
+    @staticmethod
+    def get_stamp(url):
+        """
+        Returns size and modification time of given file, None if there is no file
+        """
+        if url is None:
+            return None
+        stat = os.stat(url)
+        return (stat.st_size, stat.st_mtime_ns)
+
+    @classmethod
+    def load(cls, url, loader, *extra):
+        """
+        Returns asset of given file and extra values (e.g. size or language),
+        the asset is loaded with loader only if it is not cached or the file is changed
+        Cached assets are shared and must not be modified
+        """
+        key = (url,) + extra
+        stamp = cls.get_stamp(url)
+        cached = cls.assets.get(key)
+        if cached is not None and cached[0] == stamp:
+            cls.assets.move_to_end(key)
+            return cached[1]
+
+        asset = loader()
+        cls.assets[key] = (stamp, asset)
+        cls.assets.move_to_end(key)
+        while len(cls.assets) > cls.MAX_ASSETS:
+            cls.assets.popitem(last=False)
+        return asset
+
+    @classmethod
+    def invalidate(cls, url=None):
+        """
+        Remove cached assets of given file, or all cached assets
+        """
+        for key in list(cls.assets.keys()):
+            if url is None or key[0] == url:
+                del cls.assets[key]
+        return
@@ -0,0 +1,163 @@
+
+import os
+import glob
+import hashlib
+import pandas as pd
+
+
+class CacheMngr:
+    """
+    Fingerprint-keyed on-disk cache of built data
+    """
+
+    HASH_CHUNK = 1 << 20
+    EXTENSION = 'pkl'
+
+
+    @classmethod
+    def hash_file(cls, url):
+        """
+        Returns hash of file content
+        """
+        digest = hashlib.sha1()
+        with open(url, 'rb') as file:
+            for chunk in iter(lambda: file.read(cls.HASH_CHUNK), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @classmethod
+    def list_files(cls, url):
+        """
+        Returns sorted list of files from given directory, or given file as list
+        """
+        if os.path.isdir(url):
+            return [os.path.join(url, filename) for filename in sorted(os.listdir(url))]
+        return [url]
+
+    @classmethod
+    def fingerprint(cls, urls, *extra):
+        """
+        Returns key calculated from names, sizes, modification times and content hashes 
+        of given files and directories, together with extra values
+        """
+        digest = hashlib.sha1()
+        for value in extra:
+            digest.update(repr(value).encode('utf-8'))
+
+        for url in urls:
+            for url_file in cls.list_files(url):
+                stat = os.stat(url_file)
+                digest.update(os.path.basename(url_file).encode('utf-8'))
+                digest.update('{}:{}'.format(stat.st_size, stat.st_mtime_ns).encode('utf-8'))
+                digest.update(cls.hash_file(url_file).encode('utf-8'))
+        return digest.hexdigest()
+
+    @classmethod
+    def content_key(cls, url, *extra):
+        """
+        Returns key calculated only from content hash of given file, together with extra values
+        """
+        digest = hashlib.sha1()
+        for value in extra:
+            digest.update(repr(value).encode('utf-8'))
+        digest.update(cls.hash_file(url).encode('utf-8'))
+        return digest.hexdigest()
+
+    @classmethod
+    def get_url(cls, cache_dir, name, key):
+        """
+        Returns location of cached object
+        """
+        return os.path.join(cache_dir, '{}-{}.{}'.format(name, key, cls.EXTENSION))
+
+    @classmethod
+    def load(cls, cache_dir, name, key):
+        """
+        Load cached object for given key, returns None if it does not exist
+        """
+        url = cls.get_url(cache_dir, name, key)
+        if not os.path.isfile(url):
+            return None
+        try:
+            return pd.read_pickle(url)
+        except Exception:
+            os.remove(url)
+            return None
+
+    @classmethod
+    def save(cls, cache_dir, name, key, obj):
+        """
+        Save object under given key and remove stale objects with the same name
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        url = cls.get_url(cache_dir, name, key)
+        url_tmp = '{}.{}.tmp'.format(url, os.getpid())
+        pd.to_pickle(obj, url_tmp)
+        os.replace(url_tmp, url)
+
+        for url_old in glob.glob(cls.get_url(cache_dir, name, '*')):
+            if url_old != url:
+                os.remove(url_old)
+        return url
+
+    @classmethod
+    def remove(cls, cache_dir, name):
+        """
+        Remove cached objects with given name
+        """
+        for url in glob.glob(cls.get_url(cache_dir, name, '*')):
+            os.remove(url)
+        return
+
+    @staticmethod
+    def hash_data(df):
+        """
+        Returns hash of values and index of given dataframe
+        """
+        return hashlib.sha1(pd.util.hash_pandas_object(df, index=True).values.tobytes()).hexdigest()
+
+    @classmethod
+    def load_bytes(cls, cache_dir, key, extension):
+        """
+        Load cached bytes for given key and mark them as recently used, returns None if they do not exist
+        """
+        url = os.path.join(cache_dir, '{}.{}'.format(key, extension))
+        try:
+            with open(url, 'rb') as file:
+                content = file.read()
+            os.utime(url)
+        except OSError:
+            return None
+        return content
+
+    @classmethod
+    def save_bytes(cls, cache_dir, key, extension, content, max_size):
+        """
+        Save bytes under given key and remove least recently used files
+        until the total size of the directory is at most max_size bytes
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        url = os.path.join(cache_dir, '{}.{}'.format(key, extension))
+        url_tmp = '{}.{}.tmp'.format(url, os.getpid())
+        with open(url_tmp, 'wb') as file:
+            file.write(content)
+        os.replace(url_tmp, url)
+
+        files = []
+        for url_file in glob.glob(os.path.join(cache_dir, '*.{}'.format(extension))):
+            try:
+                stat = os.stat(url_file)
+            except OSError:
+                continue
+            files.append((stat.st_mtime_ns, stat.st_size, url_file))
+        total_size = sum(size for _, size, _ in files)
+        for _, size, url_file in sorted(files):
+            if total_size <= max_size:
+                break
+            if url_file != url:
+                try:
+                    os.remove(url_file)
+                except OSError:
+                    pass
+                total_size -= size
+        return url
@@ -1,94 +1,107 @@
 
 import os
+import csv
 import numpy as np
 import pandas as pd
-import geopandas as gpd
 import cyrtranslit
-import missingno as msno 
-import matplotlib.pyplot as plt
 
 from configparser import ConfigParser
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from mngrcache import CacheMngr
+from mngrasset import AssetMngr
+from mngrname import NameMngr
+from mngrtrace import TraceMngr
 
 
-class DataMngr:
+class ConfigMeta(type):
+    """
+    Loads configuration of the class on the first access to any of its configured attributes
+    """
+
+    def __getattr__(cls, name):
+        if name.startswith('__') or cls.config_loaded:
+            raise AttributeError("type object '{}' has no attribute '{}'".format(cls.__name__, name))
+        cls.load_config()
+        return getattr(cls, name)
+
+
+class DataMngr(metaclass=ConfigMeta):
     """
     Loading and building data
     """
 
-    # Directory structure 
-    ROOT_DIR = os.getcwd()
+    # Directory structure, root directory is given by environment variable or it is parent of the source directory
+    ROOT_DIR = os.environ.get('COVID19_ROOT', os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     CONFIG_DIR = os.path.join(ROOT_DIR, 'config')
     DATAIN_DIR = os.path.join(ROOT_DIR, 'data/input')
     OUTPUT_DIR = os.path.join(ROOT_DIR, 'data/output')
     MAP_DIR = os.path.join(ROOT_DIR, 'data/map')
     LOGO_DIR = os.path.join(ROOT_DIR, 'data/logo')
+    CACHE_DIR = os.path.join(ROOT_DIR, 'data/cache')
 
-    # Parameters
+    # Parameters, file names and labels are loaded from configuration on the first access
     url_config = os.path.join(CONFIG_DIR, 'config.ini')
-    config = ConfigParser()
-    config.read(url_config)
+    lang_url = os.path.join(CONFIG_DIR, 'lang.ini')
+    config_loaded = False
 
     PARAM = 'param'
-    LANG = config.get(PARAM, 'LANG')
-    LOGO_SIZE = int(config.get(PARAM, 'LOGO_SIZE'))
-
-    WIDTH_BARH = int(config.get(PARAM, 'WIDTH_BARH'))
-    HEIGHT_BARH = int(config.get(PARAM, 'HEIGHT_BARH'))
-    DPI_BARH = int(config.get(PARAM, 'DPI_BARH'))
-    DAY_FRAMES_BARH = int(config.get(PARAM, 'DAY_FRAMES_BARH'))
-    INTERVAL_BARH = int(config.get(PARAM, 'INTERVAL_BARH'))
-
-    WIDTH_MAP = int(config.get(PARAM, 'WIDTH_MAP'))
-    HEIGHT_MAP = int(config.get(PARAM, 'HEIGHT_MAP'))
-    DPI_MAP = int(config.get(PARAM, 'DPI_MAP'))
-    DAY_FRAMES_MAP = int(config.get(PARAM, 'DAY_FRAMES_MAP'))
-    INTERVAL_MAP = int(config.get(PARAM, 'INTERVAL_MAP'))
-
+    PARAM_INT = ['LOGO_SIZE', 
+                    'WIDTH_BARH', 'HEIGHT_BARH', 'DPI_BARH', 'DAY_FRAMES_BARH', 'INTERVAL_BARH', 
+                    'WIDTH_MAP', 'HEIGHT_MAP', 'DPI_MAP', 'DAY_FRAMES_MAP', 'INTERVAL_MAP']
     FILE = 'file'
-    GEO_FILENAME = config.get(FILE, 'GEO_FILENAME')
-    POPUL_FILENAME = config.get(FILE, 'POPUL_FILENAME')
-    MAP_FILENAME = config.get(FILE, 'MAP_FILENAME')
-    LOGO_FILENAME = config.get(FILE, 'LOGO_FILENAME')
-    NEWS_FILENAME = config.get(FILE, 'NEWS_FILENAME')
-
-    # Labels
-    lang_url = os.path.join(CONFIG_DIR, 'lang.ini')
-    labels = ConfigParser()
-    labels.read(lang_url)
-
-    DATE = labels.get(LANG, 'DATE')
-    CITY = labels.get(LANG, 'CITY')
-    POPULATION = labels.get(LANG, 'POPULATION')
-    INFECTED = labels.get(LANG, 'INFECTED')
-    RATIO_INFECTED = labels.get(LANG, 'RATIO_INFECTED')
-    ISOLATED = labels.get(LANG, 'ISOLATED')
-    RATIO_ISOLATED = labels.get(LANG, 'RATIO_ISOLATED')
-    RATIO_INFECTED_ISOLATED = labels.get(LANG, 'RATIO_INFECTED_ISOLATED')
-    LATITUDE = labels.get(LANG, 'LATITUDE')
-    LONGITUDE = labels.get(LANG, 'LONGITUDE')
-
-    TITLE_INFECTED = labels.get(LANG, 'TITLE_INFECTED')
-    XLABEL_INFECTED = labels.get(LANG, 'XLABEL_INFECTED')
-    TITLE_RATIO_INFECTED = labels.get(LANG, 'TITLE_RATIO_INFECTED')
-    XLABEL_RATIO_INFECTED = labels.get(LANG, 'XLABEL_RATIO_INFECTED')
-
-    TITLE_ISOLATED = labels.get(LANG, 'TITLE_ISOLATED')
-    XLABEL_ISOLATED = labels.get(LANG, 'XLABEL_ISOLATED')
-    TITLE_RATIO_ISOLATED = labels.get(LANG, 'TITLE_RATIO_ISOLATED')
-    XLABEL_RATIO_ISOLATED = labels.get(LANG, 'XLABEL_RATIO_ISOLATED')
-
-    TITLE_INFECTED_ISOLATED = labels.get(LANG, 'TITLE_INFECTED_ISOLATED')
-    XLABEL_INFECTED_ISOLATED = labels.get(LANG, 'XLABEL_INFECTED_ISOLATED')
+    FILE_NAMES = ['GEO_FILENAME', 'POPUL_FILENAME', 'MAP_FILENAME', 'LOGO_FILENAME', 'NEWS_FILENAME']
+    LABELS = ['DATE', 'CITY', 'POPULATION', 'INFECTED', 'RATIO_INFECTED', 'ISOLATED', 'RATIO_ISOLATED', 
+                'RATIO_INFECTED_ISOLATED', 'LATITUDE', 'LONGITUDE', 
+                'RATE_INFECTED', 'RATE_ISOLATED', 'NEW_INFECTED', 'NEW_ISOLATED', 
+                'WEEKLY_INFECTED', 'WEEKLY_ISOLATED', 'GROWTH_INFECTED', 'GROWTH_ISOLATED', 
+                'TITLE_INFECTED', 'XLABEL_INFECTED', 'TITLE_RATIO_INFECTED', 'XLABEL_RATIO_INFECTED', 
+                'TITLE_ISOLATED', 'XLABEL_ISOLATED', 'TITLE_RATIO_ISOLATED', 'XLABEL_RATIO_ISOLATED', 
+                'TITLE_INFECTED_ISOLATED', 'XLABEL_INFECTED_ISOLATED']
 
     # Cleaning keywords
     PREFIX = 'Град '
     INVALID_WORDS = ['област', 'регион', 'србиј']
+    LATIN_NAMES = {'Belgrade': 'Београд'}
+
+    # Integer join key of cities/municipalities, it is not part of built data
+    CITY_ID = 'city_id'
+    namemngr = None
 
-    # Coefficients
-    RATIO_INFECTED_COEFF = 1E3
-    RATIO_ISOLATED_COEFF = 1E3
-    RATIO_INFECTED_ISOLATED_COEFF = 1E2
+    # Ingest
+    STAT_HEADER_ROWS = 3
+    PARALLEL_MIN_FILES = 64
+    WORKERS = os.cpu_count() or 1
 
+    # Cache
+    CACHE_VERSION = 2
+    CACHE_BUILD = 'build'
+    CACHE_INCREMENTAL = 'incremental'
+    CACHE_SIDECAR = 'sidecar'
+
+
+    @classmethod
+    def load_config(cls):
+        """
+        Load parameters, file names and labels from configuration files,
+        attributes already set on the class (e.g. overridden parameters) are kept
+        """
+        cls.config_loaded = True
+        config = ConfigParser()
+        config.read(cls.url_config)
+        labels = ConfigParser()
+        labels.read(cls.lang_url)
+
+        values = dict(config=config, labels=labels, LANG=config.get(cls.PARAM, 'LANG'))
+        values.update({name: int(config.get(cls.PARAM, name)) for name in cls.PARAM_INT})
+        values.update({name: config.get(cls.FILE, name) for name in cls.FILE_NAMES})
+        lang = cls.__dict__.get('LANG', values['LANG'])
+        values.update({name: labels.get(lang, name) for name in cls.LABELS})
+
+        for name, value in values.items():
+            if name not in cls.__dict__:
+                setattr(cls, name, value)
+        return
 
     @staticmethod
     def describe_data(df, info_flag):
@@ -96,6 +109,8 @@ class DataMngr:
         Describe given dataframe
         """
         if info_flag:
+            import missingno as msno
+            import matplotlib.pyplot as plt
             print(df)
             print('NaN:\n', df.isna().sum())
             print('NaN rows:\n', df[df.isna().any(axis=1)])
@@ -120,6 +135,13 @@ class DataMngr:
         """
         return cyrtranslit.to_cyrillic(text)
 
+    @classmethod
+    def clean_latin(cls, text):
+        """
+        Convert Latin name of city/municipality to Serbian-Cyrillic name
+        """
+        return cls.latin_to_cyrillic(cls.LATIN_NAMES.get(text, text))
+
     @staticmethod
     def date_to_str(date):
         """
@@ -150,17 +172,106 @@ class DataMngr:
         return contains_number(text) or contains_invalid_word(text)
 
 
+    @classmethod
+    def get_namemngr(cls):
+        """
+        Returns dictionary of cities/municipalities persisted for current cleaning rules
+        """
+        key = CacheMngr.fingerprint([], cls.CACHE_VERSION, cls.PREFIX, cls.LATIN_NAMES)
+        if cls.namemngr is None or cls.namemngr.key != key or cls.namemngr.cache_dir != cls.CACHE_DIR:
+            cls.namemngr = NameMngr(cls.CACHE_DIR, key)
+        return cls.namemngr
+
+
+    @classmethod
+    def parse_statistic_file(cls, url):
+        """
+        Parse daily statistic file with fixed layout, date in the first row followed by 
+        two caption rows and rank/territory/value rows
+        Returns day, list of raw names and list of values
+        """
+        names = []
+        values = []
+        with open(url, encoding='utf-8-sig', newline='') as file:
+            rows = csv.reader(file)
+            day = next(rows)[1]
+            for _ in range(cls.STAT_HEADER_ROWS - 1):
+                next(rows)
+            for row in rows:
+                if len(row) < 3 or not row[1] or not row[2]:
+                    continue
+                names.append(row[1])
+                values.append(float(row[2]))
+        return day, names, values
+
+    @classmethod
+    def parse_statistic_files(cls, urls):
+        """
+        Parse batch of daily statistic files
+        Returns days, list of raw names, list of values and number of rows per day
+        """
+        days = []
+        names = []
+        values = []
+        counts = []
+        for url in urls:
+            day, day_names, day_values = cls.parse_statistic_file(url)
+            days.append(day)
+            names.extend(day_names)
+            values.extend(day_values)
+            counts.append(len(day_names))
+        return days, names, values, counts
+
+    @classmethod
+    def build_statistic_data(cls, batches, target_col):
+        """
+        Build single dataframe from parsed batches of daily statistic files, names are cleaned once per distinct name
+        """
+        days = []
+        names = []
+        values = []
+        counts = []
+        for batch_days, batch_names, batch_values, batch_counts in batches:
+            days.extend(batch_days)
+            names.extend(batch_names)
+            values.extend(batch_values)
+            counts.extend(batch_counts)
+
+        data = pd.DataFrame({
+            cls.CITY: cls.get_namemngr().normalize(names, cls.clean_prefix),
+            target_col: np.array(values, dtype=np.float64),
+            cls.DATE: pd.to_datetime(days).repeat(counts)
+        })
+        return data
+
+    @classmethod
+    @TraceMngr.traced('data')
+    def load_statistic_data(cls, url, target_col, info, workers=None):
+        """
+        Load and clean data from all daily statistic files in given directory
+        Files are parsed in batches across process pool and concatenated once
+        """
+        urls = [os.path.join(url, filename) for filename in sorted(os.listdir(url))]
+        workers = cls.WORKERS if workers is None else workers
+        workers = max(1, min(workers, len(urls)))
+
+        if workers > 1 and len(urls) >= cls.PARALLEL_MIN_FILES:
+            batches = [urls[i::workers] for i in range(workers)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = list(executor.map(cls.parse_statistic_files, batches))
+        else:
+            parsed = [cls.parse_statistic_files(urls)]
+
+        data = cls.build_statistic_data(parsed, target_col)
+        cls.describe_data(data, info)
+        return data
+
     @classmethod
     def load_single_infect_data(cls, url, info):
         """
         Load and clean data for COVID-19 infected cases by cities/municipalities
         """
-        data = pd.read_csv(url, usecols=[1,2], names=[cls.CITY, cls.INFECTED], header=None)
-        day = pd.Timestamp(data.iloc[0, 0])
-        data = data.iloc[3:].dropna()
-        data[cls.DATE] = day
-        data[cls.INFECTED] = data[cls.INFECTED].astype(float)
-        data[cls.CITY] = data[cls.CITY].apply(cls.clean_prefix)
+        data = cls.build_statistic_data([cls.parse_statistic_files([url])], cls.INFECTED)
         cls.describe_data(data, info)
         return data
 
@@ -169,26 +280,14 @@ class DataMngr:
         """
         Load and clean data for COVID-19 infected cases by cities/municipalities for the entire period
         """
-        data = pd.DataFrame()
-        for filename in os.listdir(url):
-            url_file = os.path.join(url, filename)
-            data_file = cls.load_single_infect_data(url_file, False)
-            data = pd.concat([data, data_file])
-
-        cls.describe_data(data, info)
-        return data
+        return cls.load_statistic_data(url, cls.INFECTED, info)
 
     @classmethod
     def load_single_isolat_data(cls, url, info):
         """
         Load and clean data for COVID-19 self-isolated cases by cities/municipalities
         """
-        data = pd.read_csv(url, usecols=[1,2], names=[cls.CITY, cls.ISOLATED], header=None)
-        day = pd.Timestamp(data.iloc[0, 0])
-        data = data.iloc[3:].dropna()
-        data[cls.DATE] = day
-        data[cls.ISOLATED] = data[cls.ISOLATED].astype(float)
-        data[cls.CITY] = data[cls.CITY].apply(cls.clean_prefix)
+        data = cls.build_statistic_data([cls.parse_statistic_files([url])], cls.ISOLATED)
         cls.describe_data(data, info)
         return data
 
@@ -197,25 +296,42 @@ class DataMngr:
         """
         Load and clean data for COVID-19 self-isolated cases by cities/municipalities for the entire period
         """
-        data = pd.DataFrame()
-        for filename in os.listdir(url):
-            url_file = os.path.join(url, filename)
-            data_file = cls.load_single_isolat_data(url_file, False)
-            data = pd.concat([data, data_file])
+        return cls.load_statistic_data(url, cls.ISOLATED, info)
 
-        cls.describe_data(data, info)
+    @classmethod
+    def load_sidecar(cls, url, reader, *extra):
+        """
+        Returns data from compact binary sidecar of given file,
+        the sidecar is created with reader only when content of the file is changed
+        """
+        name = '{}-{}'.format(cls.CACHE_SIDECAR, os.path.splitext(os.path.basename(url))[0])
+        key = CacheMngr.content_key(url, cls.CACHE_VERSION, *extra)
+        data = CacheMngr.load(cls.CACHE_DIR, name, key)
+        if data is None:
+            data = reader(url)
+            CacheMngr.save(cls.CACHE_DIR, name, key, data)
         return data
 
     @classmethod
+    @TraceMngr.traced('data')
     def load_populat_data(cls, url, info):
         """
         Load and clean data for cities/municipalities population in Serbia 
         """
+        populat_data = cls.load_sidecar(url, cls.read_populat_data, cls.CITY, cls.POPULATION)
+        cls.describe_data(populat_data, info)
+        return populat_data
+
+    @classmethod
+    def read_populat_data(cls, url):
+        """
+        Read and clean data for cities/municipalities population in Serbia from Excel file
+        """
         populat_data = pd.read_excel(url, usecols='A,D', skiprows=7, skipfooter=44, header=None)
         populat_data.columns = [cls.CITY, cls.POPULATION]
         populat_data = populat_data.dropna()
         populat_data[cls.POPULATION] = populat_data[cls.POPULATION].astype(int)
-        populat_data[cls.CITY] = populat_data[cls.CITY].apply(cls.clean_prefix)
+        populat_data[cls.CITY] = cls.get_namemngr().normalize(populat_data[cls.CITY], cls.clean_prefix)
 
         not_city_rows = populat_data[populat_data[cls.CITY].apply(cls.is_not_city)]
         populat_data = populat_data.drop(not_city_rows.index)
@@ -223,25 +339,73 @@ class DataMngr:
 
         #print('Cities with same subregion name:\n', populat_data.groupby(cls.CITY).filter(lambda group: len(group) >= 2))
         populat_data = populat_data.groupby(cls.CITY).max()       # select main city from municipalities with same name
-        cls.describe_data(populat_data, info)
         return populat_data
 
     @classmethod
+    @TraceMngr.traced('data')
     def load_geo_data(cls, url, info):
         """
         Load geographic coordinates for cities/municipalities in Serbia
         """
         geo_data = pd.read_csv(url, usecols=[0,1,2], names=[cls.CITY, cls.LATITUDE, cls.LONGITUDE], header=0)
         geo_data = geo_data.dropna()            
-        geo_data[cls.CITY] = geo_data[cls.CITY].replace('Belgrade', 'Београд').apply(cls.latin_to_cyrillic)
+        geo_data[cls.CITY] = cls.get_namemngr().normalize(geo_data[cls.CITY], cls.clean_latin)
         geo_data = geo_data.set_index(cls.CITY)
         cls.describe_data(geo_data, info)
         return geo_data
 
     @classmethod
-    def load_build_data(cls, info=False):
+    def get_build_key(cls):
+        """
+        Returns fingerprint of all inputs and settings used for building data
+        """
+        urls = [os.path.join(cls.DATAIN_DIR, 'infected'),
+                os.path.join(cls.DATAIN_DIR, 'isolated'),
+                os.path.join(cls.DATAIN_DIR, cls.POPUL_FILENAME),
+                os.path.join(cls.DATAIN_DIR, cls.GEO_FILENAME),
+                cls.url_config,
+                cls.lang_url]
+        return CacheMngr.fingerprint(urls, cls.CACHE_VERSION, cls.LANG)
+
+    @classmethod
+    def get_static_key(cls):
+        """
+        Returns fingerprint of inputs and settings which are not daily statistics
+        """
+        urls = [os.path.join(cls.DATAIN_DIR, cls.POPUL_FILENAME),
+                os.path.join(cls.DATAIN_DIR, cls.GEO_FILENAME),
+                cls.url_config,
+                cls.lang_url]
+        return CacheMngr.fingerprint(urls, cls.CACHE_VERSION, cls.LANG)
+
+    @classmethod
+    @TraceMngr.traced('data')
+    def load_build_data(cls, info=False, cache=True, incremental=False):
         """
         Returns loaded and built data
+        Parameters:
+            info         - describe data for each step of building
+            cache        - use cached data if inputs are not changed, otherwise build and cache data
+            incremental  - ingest only new or changed daily statistic files and rebuild only affected dates
+        """
+        if incremental:
+            return cls.load_incremental_data(info)
+
+        if not cache or info:
+            return cls.build_data(info)
+
+        key = cls.get_build_key()
+        data = CacheMngr.load(cls.CACHE_DIR, cls.CACHE_BUILD, key)
+        if data is None:
+            data = cls.build_data(info)
+            CacheMngr.save(cls.CACHE_DIR, cls.CACHE_BUILD, key, data)
+        return data
+
+    @classmethod
+    @TraceMngr.traced('data')
+    def build_data(cls, info=False):
+        """
+        Returns data loaded and built from input files
         """
         # Load
         url_infect = os.path.join(cls.DATAIN_DIR, 'infected')
@@ -256,53 +420,246 @@ class DataMngr:
         url_geo = os.path.join(cls.DATAIN_DIR, cls.GEO_FILENAME)
         geo_data = cls.load_geo_data(url_geo, info)
 
+        return cls.merge_data(infect_data, isolat_data, populat_data, geo_data, info)
+
+    @classmethod
+    @TraceMngr.traced('data')
+    def merge_data(cls, infect_data, isolat_data, populat_data, geo_data, info=False):
+        """
+        Returns merged data indexed by date, derived metrics are computed by MetricMngr
+        Data is joined on integer city ids, names without match are recorded in the dictionary report
+        """
+        # Join keys
+        namemngr = cls.get_namemngr()
+        infect_ids = namemngr.get_ids(infect_data[cls.CITY])
+        isolat_ids = namemngr.get_ids(isolat_data[cls.CITY])
+        populat_ids = namemngr.get_ids(populat_data.index)
+        geo_ids = namemngr.get_ids(geo_data.index)
+
+        cases_ids = np.union1d(infect_ids, isolat_ids)
+        namemngr.unmatched = {}
+        namemngr.report('statistic', 'population', cases_ids, populat_ids)
+        namemngr.report('statistic', 'geo', np.intersect1d(cases_ids, populat_ids), geo_ids)
+        namemngr.save()
+
+        infect_data = infect_data.drop(columns=cls.CITY).assign(**{cls.CITY_ID: infect_ids})
+        isolat_data = isolat_data.drop(columns=cls.CITY).assign(**{cls.CITY_ID: isolat_ids})
+        populat_data = populat_data.set_index(pd.Index(populat_ids, name=cls.CITY_ID))
+        geo_data = geo_data.set_index(pd.Index(geo_ids, name=cls.CITY_ID))
+
         # Merge
-        infect_isolat_data = pd.merge(infect_data, isolat_data, on=[cls.CITY, cls.DATE], how='outer')
+        infect_isolat_data = pd.merge(infect_data, isolat_data, on=[cls.CITY_ID, cls.DATE], how='outer')
         cls.describe_data(infect_isolat_data, info)
 
-        cases_populat_data = pd.merge(infect_isolat_data, populat_data, on=cls.CITY, how='inner')
+        cases_populat_data = pd.merge(infect_isolat_data, populat_data, on=cls.CITY_ID, how='inner')
         cls.describe_data(cases_populat_data, info)
 
-        data = pd.merge(cases_populat_data, geo_data, on=cls.CITY, how='inner')
+        data = pd.merge(cases_populat_data, geo_data, on=cls.CITY_ID, how='inner')
+        data.insert(0, cls.CITY, namemngr.get_names(data.pop(cls.CITY_ID).to_numpy()))
+        cls.describe_data(data, info)
+
+        data = data.set_index(cls.DATE).sort_index()
         cls.describe_data(data, info)
+        if info:
+            namemngr.print_report()
+        return data
+
+
+    @classmethod
+    def scan_statistic_dir(cls, url, manifest):
+        """
+        Compare daily statistic files in given directory with manifest of already ingested files,
+        stat of unchanged files with new modification time is updated in place
+        Returns list of new or changed files with their stat and hash, list of removed files
+        and whether manifest is updated
+        """
+        changed = []
+        updated = False
+        filenames = sorted(os.listdir(url))
+        for filename in filenames:
+            url_file = os.path.join(url, filename)
+            stat = os.stat(url_file)
+            entry = manifest.get(filename)
+            if entry is not None and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+                continue
+
+            file_hash = CacheMngr.hash_file(url_file)
+            if entry is not None and entry['hash'] == file_hash:
+                entry['size'] = stat.st_size
+                entry['mtime'] = stat.st_mtime_ns
+                updated = True
+                continue
+            changed.append((filename, stat, file_hash))
+
+        removed = sorted(set(manifest) - set(filenames))
+        return changed, removed, updated
 
-        # Transform
-        infected_cases = data[data[cls.INFECTED].notna()]
-        data[cls.RATIO_INFECTED] = (infected_cases[cls.INFECTED] / infected_cases[cls.POPULATION]) * cls.RATIO_INFECTED_COEFF
+    @classmethod
+    def parse_statistic_urls(cls, urls, workers=None):
+        """
+        Parse each of given daily statistic files, across process pool if there are enough files
+        Returns parsed batch for each file
+        """
+        workers = cls.WORKERS if workers is None else workers
+        workers = max(1, min(workers, len(urls)))
 
-        isolated_cases = data[data[cls.ISOLATED].notna()]
-        data[cls.RATIO_ISOLATED] = (isolated_cases[cls.ISOLATED] / isolated_cases[cls.POPULATION]) * cls.RATIO_ISOLATED_COEFF
+        if workers > 1 and len(urls) >= cls.PARALLEL_MIN_FILES:
+            chunksize = -(-len(urls) // workers)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(cls.parse_statistic_files, [[url] for url in urls], chunksize=chunksize))
+        return [cls.parse_statistic_files([url]) for url in urls]
 
-        both_cases = data[data[cls.INFECTED].notna() & data[cls.ISOLATED].notna()]
-        data[cls.RATIO_INFECTED_ISOLATED] = (both_cases[cls.INFECTED] / both_cases[cls.ISOLATED]) * cls.RATIO_INFECTED_ISOLATED_COEFF
+    @classmethod
+    def get_incremental_name(cls, *parts):
+        """
+        Returns name of cache entry of incremental ingest
+        """
+        return '-'.join((cls.CACHE_INCREMENTAL,) + parts)
 
-        data = data.set_index(cls.DATE).sort_index()
+    @classmethod
+    def ingest_statistic_dir(cls, url, target_col, manifest):
+        """
+        Ingest only new or changed daily statistic files from given directory, manifest is updated in place
+        and data of each ingested file is stored as separate cache entry
+        Returns set of affected days and whether manifest is updated
+        """
+        changed, removed, updated = cls.scan_statistic_dir(url, manifest)
+        affected = set()
+
+        for filename in removed:
+            entry = manifest.pop(filename)
+            affected.add(entry['day'])
+            CacheMngr.remove(cls.CACHE_DIR, entry['name'])
+
+        urls = [os.path.join(url, filename) for filename, _, _ in changed]
+        parsed = cls.parse_statistic_urls(urls)
+        for (filename, stat, file_hash), batch in zip(changed, parsed):
+            day = pd.Timestamp(batch[0][0])
+            if filename in manifest:
+                affected.add(manifest[filename]['day'])
+            name = cls.get_incremental_name('file', CacheMngr.fingerprint([], target_col, filename))
+            manifest[filename] = dict(size=stat.st_size, mtime=stat.st_mtime_ns, hash=file_hash, day=day, name=name)
+            CacheMngr.save(cls.CACHE_DIR, name, file_hash, cls.build_statistic_data([batch], target_col))
+            affected.add(day)
+        return affected, updated or len(affected) > 0
+
+    @classmethod
+    def select_statistic_data(cls, url, manifest, days, target_col):
+        """
+        Returns ingested data of daily statistic files for given days, 
+        file missing in the cache is parsed again from given directory
+        """
+        selected = []
+        for filename, entry in manifest.items():
+            if entry['day'] not in days:
+                continue
+            frame = CacheMngr.load(cls.CACHE_DIR, entry['name'], entry['hash'])
+            if frame is None:
+                frame = cls.build_statistic_data([cls.parse_statistic_files([os.path.join(url, filename)])], target_col)
+                CacheMngr.save(cls.CACHE_DIR, entry['name'], entry['hash'], frame)
+            selected.append(frame)
+
+        if len(selected) == 0:
+            return cls.build_statistic_data([], target_col)
+        return pd.concat(selected, ignore_index=True)
+
+    @classmethod
+    @TraceMngr.traced('data')
+    def load_incremental_data(cls, info=False):
+        """
+        Returns built data, where only new or changed daily statistic files are parsed 
+        and only affected dates are merged
+        Manifest, data of each file and merged data of each day are separate cache entries,
+        so only entries of new or changed files and of affected days are written
+        """
+        # Load manifest, stored data is discarded if inputs other than daily statistics are changed
+        key = cls.get_static_key()
+        name_manifest = cls.get_incremental_name('manifest')
+        name_static = cls.get_incremental_name('static')
+        state = CacheMngr.load(cls.CACHE_DIR, name_manifest, key)
+        static = CacheMngr.load(cls.CACHE_DIR, name_static, key)
+        if state is None or static is None:
+            url_populat = os.path.join(cls.DATAIN_DIR, cls.POPUL_FILENAME)
+            url_geo = os.path.join(cls.DATAIN_DIR, cls.GEO_FILENAME)
+            static = dict(populat=cls.load_populat_data(url_populat, info), geo=cls.load_geo_data(url_geo, info))
+            CacheMngr.save(cls.CACHE_DIR, name_static, key, static)
+            CacheMngr.remove(cls.CACHE_DIR, cls.get_incremental_name('state'))
+            state = dict(manifest={cls.INFECTED: {}, cls.ISOLATED: {}}, days=[])
+
+        # Ingest
+        affected = set()
+        updated = False
+        urls = {cls.INFECTED: os.path.join(cls.DATAIN_DIR, 'infected'), cls.ISOLATED: os.path.join(cls.DATAIN_DIR, 'isolated')}
+        for target_col, url in urls.items():
+            col_affected, col_updated = cls.ingest_statistic_dir(url, target_col, state['manifest'][target_col])
+            affected |= col_affected
+            updated |= col_updated
+
+        # Load stored days which are not affected, days missing in the cache are merged again
+        frames = {}
+        for day in state['days']:
+            if day not in affected:
+                frame = CacheMngr.load(cls.CACHE_DIR, cls.get_incremental_name('day', day.strftime('%Y%m%d')), key)
+                if frame is None:
+                    affected.add(day)
+                else:
+                    frames[day] = frame
+
+        # Merge affected days and store each of them
+        infect_data = cls.select_statistic_data(urls[cls.INFECTED], state['manifest'][cls.INFECTED], affected, cls.INFECTED)
+        isolat_data = cls.select_statistic_data(urls[cls.ISOLATED], state['manifest'][cls.ISOLATED], affected, cls.ISOLATED)
+        days_data = cls.merge_data(infect_data, isolat_data, static['populat'], static['geo'], info)
+        for day, day_data in days_data.groupby(level=0, sort=True):
+            frames[day] = day_data
+        for day in affected:
+            name = cls.get_incremental_name('day', day.strftime('%Y%m%d'))
+            if day in frames:
+                CacheMngr.save(cls.CACHE_DIR, name, key, frames[day])
+            else:
+                CacheMngr.remove(cls.CACHE_DIR, name)
+
+        if updated or len(affected) > 0:
+            state['days'] = sorted(frames)
+            CacheMngr.save(cls.CACHE_DIR, name_manifest, key, state)
+
+        data = pd.concat([frames[day] for day in sorted(frames)]) if len(frames) > 0 else days_data
         cls.describe_data(data, info)
         return data
 
 
     @classmethod
+    @TraceMngr.traced('data')
     def load_map(cls):
         """
-        Loading map into geo-pandas dataframe
+        Loading map into geo-pandas dataframe, the map is shared and must not be modified
         """
+        import geopandas as gpd
         url_map = os.path.join(cls.MAP_DIR, cls.MAP_FILENAME)
-        serbia = gpd.read_file(url_map)
+        serbia = AssetMngr.load(url_map, partial(gpd.read_file, url_map))
         return serbia
 
     
     @classmethod
+    @TraceMngr.traced('data')
     def load_news(cls, info=False):
         """
         Loading the News, textual information about COVID-19
         """
         url_news = os.path.join(cls.DATAIN_DIR, cls.NEWS_FILENAME)
-        news = pd.read_excel(url_news, header=0)
-        news['date'] = pd.to_datetime(news['date'])
-        news = news.set_index('date')[cls.LANG]
+        news = AssetMngr.load(url_news, lambda: cls.load_sidecar(url_news, cls.read_news)[cls.LANG], cls.LANG)
         cls.describe_data(news, info)
         return news
 
+    @classmethod
+    def read_news(cls, url):
+        """
+        Read the News in all languages from Excel file
+        """
+        news = pd.read_excel(url, header=0)
+        news['date'] = pd.to_datetime(news['date'])
+        news = news.set_index('date')
+        return news
+
 
 if __name__ == "__main__": 
     data = DataMngr.load_build_data(info=True)
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from mngrdata import DataMngr
+from mngrmetric import MetricMngr
+
+
+class MatrixStore:
+    """
+    Data as dense days x cities matrices of columns and derived metrics,
+    with sorted date axis and dictionary of cities/municipalities
+    """
+
+    def __init__(self, metricmngr=None):
+        """
+        Parameters:
+            metricmngr - metric manager of the data, columns and derived metrics are read through it
+        """
+        self.metricmngr = MetricMngr() if metricmngr is None else metricmngr
+        data = self.metricmngr.data
+        self.day_codes, self.days = pd.factorize(data.index, sort=True)
+        self.city_codes, cities = pd.factorize(data[DataMngr.CITY])
+        self.cities = np.asarray(cities, dtype=str)
+        self.city_ids = {city: i for i, city in enumerate(self.cities)}
+        self.city_order = np.argsort(np.argsort(self.cities, kind='stable'))     # position of city in order of names
+        self.matrices = {}
+
+    @property
+    def shape(self):
+        return len(self.days), len(self.cities)
+
+    def get_day(self, day=None):
+        """
+        Returns row of the last day not after given day, the first day if there is no such day,
+        the last day if day is not given
+        """
+        if day is None:
+            return len(self.days) - 1
+        return max(0, int(np.searchsorted(self.days, pd.Timestamp(day), side='right')) - 1)
+
+    def vector(self, column):
+        """
+        Returns values of column or derived metric for each row of the data
+        """
+        return self.metricmngr.get_column(column)
+
+    def matrix(self, column):
+        """
+        Returns days x cities matrix of column or derived metric, NaN where there is no value
+        """
+        matrix = self.matrices.get(column)
+        if matrix is None:
+            matrix = np.full(self.shape, np.nan)
+            matrix[self.day_codes, self.city_codes] = self.vector(column)
+            matrix.flags.writeable = False
+            self.matrices[column] = matrix
+        return matrix
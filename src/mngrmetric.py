@@ -0,0 +1,198 @@
+import numpy as np
+import pandas as pd
+
+from collections import OrderedDict
+from mngrdata import DataMngr
+from mngrcache import CacheMngr
+from mngrtrace import TraceMngr
+
+
+class MetricMngr:
+    """
+    Registry of derived metrics, each metric is computed from base columns of built data on the first request
+    and memoized per dataset version, shared data is never modified
+    """
+
+    # Derived metric (label name) -> (kind, arguments), metrics may be derived from other metrics
+    METRICS = {
+        'RATIO_INFECTED':           ('ratio', 'INFECTED', 'POPULATION', 1E3),
+        'RATIO_ISOLATED':           ('ratio', 'ISOLATED', 'POPULATION', 1E3),
+        'RATIO_INFECTED_ISOLATED':  ('ratio', 'INFECTED', 'ISOLATED', 1E2),
+        'RATE_INFECTED':            ('ratio', 'INFECTED', 'POPULATION', 1E5),
+        'RATE_ISOLATED':            ('ratio', 'ISOLATED', 'POPULATION', 1E5),
+        'NEW_INFECTED':             ('new', 'INFECTED'),
+        'NEW_ISOLATED':             ('new', 'ISOLATED'),
+        'WEEKLY_INFECTED':          ('rolling_sum', 'NEW_INFECTED', 7),
+        'WEEKLY_ISOLATED':          ('rolling_sum', 'NEW_ISOLATED', 7),
+        'GROWTH_INFECTED':          ('growth', 'INFECTED', 1E2),
+        'GROWTH_ISOLATED':          ('growth', 'ISOLATED', 1E2),
+    }
+    MAX_VERSIONS = 4
+    memo = OrderedDict()        # dataset version -> {metric name: values}, least recently used first
+
+
+    def __init__(self, data=None):
+        self.data = DataMngr.load_build_data(info=False) if data is None else data
+        self.version = CacheMngr.hash_data(self.data)
+        self.frames = {}
+        self.series = None
+
+    @classmethod
+    def register(cls, name, kind, *args):
+        """
+        Declare derived metric with label name, kind of computation and its arguments
+        """
+        cls.METRICS[name] = (kind,) + args
+        return
+
+    @classmethod
+    def get_name(cls, column):
+        """
+        Returns label name of given column, None if it is not a derived metric
+        """
+        for name in cls.METRICS:
+            if getattr(DataMngr, name) == column:
+                return name
+        return None
+
+    def get_memo(self):
+        """
+        Returns memoized metrics of the dataset version
+        """
+        values = self.memo.get(self.version)
+        if values is None:
+            values = {}
+            self.memo[self.version] = values
+        self.memo.move_to_end(self.version)
+        while len(self.memo) > self.MAX_VERSIONS:
+            self.memo.popitem(last=False)
+        return values
+
+    def values(self, name):
+        """
+        Returns values of base column or derived metric with given label name as read-only array
+        """
+        if name not in self.METRICS:
+            return self.data[getattr(DataMngr, name)].to_numpy(dtype=np.float64)
+
+        memo = self.get_memo()
+        values = memo.get(name)
+        if values is None:
+            kind, *args = self.METRICS[name]
+            with TraceMngr.span('MetricMngr.' + kind, 'metric'):
+                values = getattr(self, 'calc_' + kind)(*args)
+            values.flags.writeable = False
+            memo[name] = values
+        return values
+
+    def get_column(self, column):
+        """
+        Returns values of base column or derived metric with given column name
+        """
+        name = self.get_name(column)
+        if name is None:
+            return self.data[column].to_numpy(dtype=np.float64)
+        return self.values(name)
+
+    def frame(self, column):
+        """
+        Returns data with given column, derived metric is added to a copy of the data
+        """
+        name = self.get_name(column)
+        if name is None:
+            return self.data
+        frame = self.frames.get(name)
+        if frame is None:
+            frame = self.data.assign(**{column: np.array(self.values(name))})
+            self.frames[name] = frame
+        return frame
+
+
+    def get_series(self):
+        """
+        Returns order of rows by city/municipality and date, position of the first row of each row's city/municipality,
+        calendar day numbers and sorted search keys (city/municipality, day) of the ordered rows
+        """
+        if self.series is None:
+            city_codes, _ = pd.factorize(self.data[DataMngr.CITY])
+            days = self.data.index.to_numpy().astype('datetime64[D]').astype(np.int64)
+            order = np.lexsort((days, city_codes))
+            new_city = np.ones(len(order), dtype=bool)
+            new_city[1:] = city_codes[order][1:] != city_codes[order][:-1]
+            first = np.maximum.accumulate(np.where(new_city, np.arange(len(order)), 0))
+
+            days = days[order] - (days.min() if len(days) > 0 else 0)
+            keys = city_codes[order] * (days.max() + 1 if len(days) > 0 else 1) + days
+            self.series = (order, first, days, keys)
+        return self.series
+
+    def get_previous(self):
+        """
+        Returns mask of ordered rows whose previous row is the previous calendar day of the same city/municipality
+        """
+        order, first, days, _ = self.get_series()
+        previous = np.zeros(len(order), dtype=bool)
+        previous[1:] = days[1:] - days[:-1] == 1
+        previous[first == np.arange(len(order))] = False
+        return previous
+
+    def calc_ratio(self, numerator, denominator, coeff):
+        """
+        Ratio of columns multiplied by coefficient, undefined for zero denominator
+        """
+        num = self.values(numerator)
+        den = self.values(denominator)
+        values = np.full(len(num), np.nan)
+        np.divide(num, den, out=values, where=den != 0)
+        return values * coeff
+
+    def calc_new(self, name):
+        """
+        Daily increase of cumulative column, undefined if city/municipality has no row for the previous day
+        """
+        order, _, _, _ = self.get_series()
+        cumulative = self.values(name)[order]
+        new = np.full(len(order), np.nan)
+        new[1:] = cumulative[1:] - cumulative[:-1]
+        new[~self.get_previous()] = np.nan
+
+        values = np.empty(len(order))
+        values[order] = new
+        return values
+
+    def calc_rolling_sum(self, name, window):
+        """
+        Sum of the column over the last window calendar days of city/municipality, undefined without any value
+        """
+        order, first, days, keys = self.get_series()
+        series = self.values(name)[order]
+        valid = np.isfinite(series)
+        sums = np.concatenate([[0], np.cumsum(np.where(valid, series, 0))])
+        counts = np.concatenate([[0], np.cumsum(valid)])
+
+        # The window of the row starts at the first row of the same city/municipality after day - window
+        end = np.arange(1, len(order) + 1)
+        start = np.maximum(np.searchsorted(keys, keys - np.minimum(days, window - 1), side='left'), first)
+        rolling = sums[end] - sums[start]
+        rolling[counts[end] == counts[start]] = np.nan
+
+        values = np.empty(len(order))
+        values[order] = rolling
+        return values
+
+    def calc_growth(self, name, coeff):
+        """
+        Daily increase of cumulative column relative to the previous day multiplied by coefficient,
+        undefined if city/municipality has no row for the previous day
+        """
+        order, _, _, _ = self.get_series()
+        cumulative = self.values(name)[order]
+        previous = np.full(len(order), np.nan)
+        previous[1:] = cumulative[:-1]
+        previous[~self.get_previous()] = np.nan
+
+        growth = np.full(len(order), np.nan)
+        np.divide(cumulative - previous, previous, out=growth, where=previous > 0)
+        values = np.empty(len(order))
+        values[order] = growth * coeff
+        return values
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+from mngrcache import CacheMngr
+
+
+class NameMngr:
+    """
+    Dictionary of cities/municipalities, each distinct raw name is normalized once into canonical name
+    with integer city id, the dictionary is persisted in the cache directory
+    """
+
+    CACHE_NAME = 'names'
+
+
+    def __init__(self, cache_dir, key):
+        """
+        Parameters:
+            cache_dir   - directory of the persisted dictionary
+            key         - version of normalization rules, dictionary of other version is discarded
+        """
+        self.cache_dir = cache_dir
+        self.key = key
+        state = CacheMngr.load(cache_dir, self.CACHE_NAME, key)
+        if state is None:
+            state = dict(raw={}, names=[])
+        self.raw = state['raw']             # normalizer -> {raw name: canonical name}
+        self.names = state['names']         # city id -> canonical name
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.unmatched = {}                 # (source, target) -> canonical names without match
+        self.changed = False
+
+    def save(self):
+        """
+        Persist the dictionary if it has new names
+        """
+        if self.changed:
+            CacheMngr.save(self.cache_dir, self.CACHE_NAME, self.key, dict(raw=self.raw, names=self.names))
+            self.changed = False
+        return
+
+    def normalize(self, names, normalizer):
+        """
+        Returns canonical names of given raw names, normalizer is called only for names not seen before
+        """
+        codes, uniques = pd.factorize(np.asarray(names, dtype=object))
+        memo = self.raw.setdefault(normalizer.__name__, {})
+        canonical = np.empty(len(uniques), dtype=object)
+        for i, name in enumerate(uniques):
+            value = memo.get(name)
+            if value is None:
+                value = normalizer(name)
+                memo[name] = value
+                self.changed = True
+            canonical[i] = value
+        return canonical[codes]
+
+    def get_ids(self, names):
+        """
+        Returns city ids of given canonical names, new names are added to the dictionary
+        """
+        codes, uniques = pd.factorize(np.asarray(names, dtype=object))
+        ids = np.empty(len(uniques), dtype=np.int64)
+        for i, name in enumerate(uniques):
+            city_id = self.ids.get(name)
+            if city_id is None:
+                city_id = len(self.names)
+                self.names.append(name)
+                self.ids[name] = city_id
+                self.changed = True
+            ids[i] = city_id
+        return ids[codes]
+
+    def get_names(self, ids):
+        """
+        Returns canonical names of given city ids
+        """
+        return np.asarray(self.names, dtype=object)[ids]
+
+    def report(self, source, target, source_ids, target_ids):
+        """
+        Record names of source without match in target
+        Returns sorted list of unmatched names
+        """
+        missing = np.setdiff1d(source_ids, target_ids)
+        names = sorted(self.get_names(missing))
+        self.unmatched[(source, target)] = names
+        return names
+
+    def print_report(self):
+        """
+        Print names of cities/municipalities which failed to match at the last merge
+        """
+        for (source, target), names in self.unmatched.items():
+            print('{} not matched in {}: {}'.format(source, target, len(names)))
+            for name in names:
+                print('    {}'.format(name))
+        return
+
+
+if __name__ == "__main__":
+    from mngrdata import DataMngr
+    DataMngr.build_data()
+    DataMngr.get_namemngr().print_report()
@@ -1,65 +1,214 @@
 
 import os
+import time
 import numpy as np
 import pandas as pd
 import matplotlib as mpl
 import matplotlib.cm as cm 
-import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
-import matplotlib.animation as animation
-import seaborn as sns
 
+from functools import partial
 from mngrdata import DataMngr
+from mngrcache import CacheMngr
+from mngrasset import AssetMngr
+from mngrrank import RankIndex, RankMngr
+from mngrmetric import MetricMngr
+from mngrmatrix import MatrixStore
+from mngrtrace import TraceMngr
+from mngrrender import RenderMngr
 from chartbarh import BarhChart
 from chartmap import MapChart
+from charttimeline import BarhTimeline, MapTimeline
 
 
 class PlotMngr:
     """
     Plotting data
     """
-    def __init__(self):
-        self.data = DataMngr.load_build_data(info=False)
+
+    STILL_DIR = 'stills'
+    STILL_CACHE_SIZE = 256 * 2**20      # bytes
+    CODE_FILES = ['chartbase.py', 'chartbarh.py', 'chartmap.py', 'chartlabel.py', 'mngrplot.py']
+    code_version = None
+
+    def __init__(self, data=None, workers=1):
+        self.data = DataMngr.load_build_data(info=False) if data is None else data
+        self.metricmngr = MetricMngr(self.data)
+        self.store = MatrixStore(self.metricmngr)
+        self.rankmngr = RankMngr(store=self.store)
         self.chart = None
+        self.workers = workers
+        self.segment = None
+        self.verbose = True
+        self.output = None
+        self.still_cache = True
+
+    @classmethod
+    def render_segment(cls, data, plot_method, plot_args, verbose, segment):
+        """
+        Render segment of animation frames (start, end, url) in worker process,
+        with verbosity of the parent plot manager
+        """
+        import matplotlib.pyplot as plt
+        plt.switch_backend('Agg')
+        pltmgr = cls(data=data, workers=1)
+        pltmgr.verbose = verbose
+        pltmgr.segment = segment
+        getattr(pltmgr, plot_method)(**plot_args)
+        return segment[2]
+
+    @classmethod
+    def render_job(cls, data, job):
+        """
+        Render single plot (method, arguments, output directory, workers) in worker process,
+        animation is rendered in segments across given number of workers
+        Returns location and size of the output file with wall time of rendering in seconds
+        """
+        import matplotlib.pyplot as plt
+        plt.switch_backend('Agg')
+        plot_method, plot_args, output_dir, workers = job
+        DataMngr.OUTPUT_DIR = output_dir
+
+        start = time.perf_counter()
+        pltmgr = cls(data=data, workers=workers)
+        pltmgr.verbose = False
+        url = getattr(pltmgr, plot_method)(**plot_args)
+        wall_time = time.perf_counter() - start
+
+        size = os.path.getsize(url) if url is not None and os.path.isfile(url) else 0
+        return url, size, wall_time
+
+    @staticmethod
+    @TraceMngr.traced('plot')
+    def select_top(data, target_col, top):
+        """
+        Returns rows of top cities/municipalities by target column for each day, 
+        ordered by day and in ascending order of values within the day
+        """
+        return data.iloc[RankIndex(MatrixStore(MetricMngr(data)), target_col).top_rows(top)]
+
+    @classmethod
+    def get_code_version(cls):
+        """
+        Returns fingerprint of the plotting source code
+        """
+        if cls.code_version is None:
+            src_dir = os.path.dirname(os.path.abspath(__file__))
+            cls.code_version = CacheMngr.fingerprint([os.path.join(src_dir, filename) for filename in cls.CODE_FILES])
+        return cls.code_version
+
+    def get_still_key(self, day_data, figsize, *extra):
+        """
+        Returns key of still image calculated from the data of shown day, figure size (width, height, dpi),
+        chart parameters, language, configuration, assets and plotting source code
+        """
+        urls = [DataMngr.url_config, DataMngr.lang_url, 
+                os.path.join(DataMngr.DATAIN_DIR, DataMngr.NEWS_FILENAME),
+                os.path.join(DataMngr.LOGO_DIR, DataMngr.LOGO_FILENAME),
+                os.path.join(DataMngr.MAP_DIR, DataMngr.MAP_FILENAME)]
+        stamps = [AssetMngr.get_stamp(url) if os.path.exists(url) else None for url in urls]
+        return CacheMngr.fingerprint([], CacheMngr.hash_data(day_data), tuple(figsize), DataMngr.LANG, stamps,
+                                     self.get_code_version(), *extra)
+
+    def load_still(self, key, plot_name):
+        """
+        Write cached still image into the output
+        Returns (True, location of the output) if the image is cached, otherwise (False, None)
+        """
+        png = CacheMngr.load_bytes(os.path.join(DataMngr.CACHE_DIR, self.STILL_DIR), key, 'png')
+        if png is None:
+            return False, None
+        if self.output is not None:
+            self.output.write(png)
+            return True, None
+        url = BarhChart.get_url(plot_name, 'png')
+        with open(url, 'wb') as file:
+            file.write(png)
+        return True, url
+
+    def save_still(self, key, url):
+        """
+        Store saved still image into the cache
+        """
+        if self.output is not None:
+            png = self.output.getvalue()
+        else:
+            with open(url, 'rb') as file:
+                png = file.read()
+        CacheMngr.save_bytes(os.path.join(DataMngr.CACHE_DIR, self.STILL_DIR), key, 'png', png, self.STILL_CACHE_SIZE)
+        return
+
+    @TraceMngr.traced('plot')
+    def animate(self, plot_method, plot_args, timeline, interval, save):
+        """
+        Setting animation for current chart
+        Saved animation is rendered in parallel across worker processes if there are more workers
+        Returns location of the animation if it is already rendered, otherwise None
+        """
+        fargs = (timeline,)
+        self.chart.set_frames(num_groups=timeline.num_days, date_frames=timeline.date_frames, interval=interval)
+        self.chart.fargs = fargs
+        self.chart.segment = self.segment
 
+        if not save:
+            self.chart.play()
+            return None
 
+        if self.segment is None and self.workers > 1:
+            url_anim = self.chart.get_url(plot_args['plot_name'], 'mp4')
+            render_segment = partial(PlotMngr.render_segment, self.data, plot_method, plot_args, self.verbose)
+            RenderMngr.render(render_segment, self.chart.total_frames, timeline.date_frames, url_anim, self.workers)
+            import matplotlib.pyplot as plt
+            plt.close(self.chart.fig)
+            return url_anim
+        return None
+
+
+    @TraceMngr.traced('plot')
     def barh_plot(self, top, target_col, anim, day, title, xlabel, ratio, stable, plot_name, save):
         """
         General function for plotting horizontal bar chart for target column by cities/municipalities
+        Returns location of saved plot, None if plot is shown on screen
         """
-        # Set target data
-        target_data = self.data[self.data[target_col].notna()]
-        target_data = target_data.sort_values(target_col, ascending=True, kind='mergesort').groupby(DataMngr.DATE).tail(top)
-        
+        # Data with target column and its rank index
+        data = self.metricmngr.frame(target_col)
+        ranks = self.rankmngr.get_index(target_col)
+
+        # Saved still image is served from the cache if it is already rendered
+        key = None
+        if not anim:
+            day_data = data.iloc[ranks.top_rows(top, ranks.get_day(day))]
+            if save and self.still_cache:
+                extremes = (ranks.top_extremes(top)[1],) if stable else ()
+                figsize = (DataMngr.WIDTH_BARH, DataMngr.HEIGHT_BARH, DataMngr.DPI_BARH)
+                key = self.get_still_key(day_data, figsize, 'barh', top, target_col, title, xlabel, ratio, stable, plot_name, *extremes)
+                cached, url = self.load_still(key, plot_name)
+                if cached:
+                    return url
+
         # Create chart
         self.chart = BarhChart(title, xlabel, ratio, stable, top)
+        self.chart.verbose = self.verbose
+        self.chart.output = self.output
         if stable:
-            max_val = target_data[target_col].max()
+            _, max_val = ranks.top_extremes(top)
             self.chart.set_xlim(0, max_val)
 
         # Draw plot
         if anim:
-            target_data = target_data.groupby(DataMngr.DATE)
-            self.chart.set_frames(num_groups=len(target_data), date_frames=DataMngr.DAY_FRAMES_BARH)
-            the_anim = animation.FuncAnimation(self.chart.fig, 
-                                                self.chart.draw_anim,
-                                                fargs=(target_data, target_col), 
-                                                init_func=self.chart.init_anim,
-                                                frames=self.chart.total_frames, 
-                                                interval=DataMngr.INTERVAL_BARH, 
-                                                blit=True, 
-                                                repeat=False)
-            self.chart.anim = the_anim
+            plot_args = dict(top=top, target_col=target_col, anim=anim, day=day, title=title, xlabel=xlabel, \
+                ratio=ratio, stable=stable, plot_name=plot_name, save=save)
+            timeline = BarhTimeline(top, DataMngr.DAY_FRAMES_BARH).compile(ranks)
+            url = self.animate('barh_plot', plot_args, timeline, DataMngr.INTERVAL_BARH, save)
+            if url is not None:
+                return url
         else:
-            # Setting data for choosen day
-            days = target_data.sort_index().loc[:pd.Timestamp(day)]
-            the_day = days.tail(1).index if len(days) > 0 else target_data.sort_index().head(1).index
-            target_data = target_data.loc[the_day]
-            # Drawing
-            self.chart.draw_img(target_data, target_col)
+            self.chart.draw_img(day_data, target_col)
 
-        self.chart.display(save, plot_name)
-        return
+        url = self.chart.display(save, plot_name)
+        if key is not None:
+            self.save_still(key, url)
+        return url
 
     def infected_barh_plot(self, top, anim=True, day=None, stable=False, save=False):
         """
@@ -71,17 +220,17 @@ class PlotMngr:
             stable   - enable fixed axis, for all frames axis maximum limit is the same
             save     - enable saving plot, otherwise just show results on screen
         """
-        self.barh_plot(top=top,
-                        target_col=DataMngr.INFECTED, 
-                        anim=anim,
-                        day=day,
-                        title=DataMngr.TITLE_INFECTED,
-                        xlabel=DataMngr.XLABEL_INFECTED,
-                        ratio=False,
-                        stable=stable,
-                        plot_name='Confirmed BarH Plot',
-                        save=save)
-        return
+        url = self.barh_plot(top=top,
+                              target_col=DataMngr.INFECTED, 
+                              anim=anim,
+                              day=day,
+                              title=DataMngr.TITLE_INFECTED,
+                              xlabel=DataMngr.XLABEL_INFECTED,
+                              ratio=False,
+                              stable=stable,
+                              plot_name='Confirmed BarH Plot',
+                              save=save)
+        return url
 
     def ratio_infected_barh_plot(self, top, anim=True, day=None, stable=False, save=False):
         """
@@ -93,17 +242,17 @@ class PlotMngr:
             stable   - enable fixed axis, for all frames axis maximum limit is the same
             save     - enable saving plot, otherwise just show results on screen
         """
-        self.barh_plot(top=top, 
-                        target_col=DataMngr.RATIO_INFECTED, 
-                        anim=anim,
-                        day=day,
-                        title=DataMngr.TITLE_RATIO_INFECTED,
-                        xlabel=DataMngr.XLABEL_RATIO_INFECTED,
-                        ratio=True,
-                        stable=stable,
-                        plot_name='Confirmed-ratio BarH Plot',
-                        save=save)
-        return
+        url = self.barh_plot(top=top, 
+                              target_col=DataMngr.RATIO_INFECTED, 
+                              anim=anim,
+                              day=day,
+                              title=DataMngr.TITLE_RATIO_INFECTED,
+                              xlabel=DataMngr.XLABEL_RATIO_INFECTED,
+                              ratio=True,
+                              stable=stable,
+                              plot_name='Confirmed-ratio BarH Plot',
+                              save=save)
+        return url
         
     def isolated_barh_plot(self, top, anim=True, day=None, stable=False, save=False):
         """
@@ -115,17 +264,17 @@ class PlotMngr:
             stable   - enable fixed axis, for all frames axis maximum limit is the same
             save     - enable saving plot, otherwise just show results on screen
         """
-        self.barh_plot(top=top, 
-                        target_col=DataMngr.ISOLATED,
-                        anim=anim,
-                        day=day, 
-                        title=DataMngr.TITLE_ISOLATED,
-                        xlabel=DataMngr.XLABEL_ISOLATED,
-                        ratio=False,
-                        stable=stable,
-                        plot_name='Isolated BarH Plot',
-                        save=save)
-        return
+        url = self.barh_plot(top=top, 
+                              target_col=DataMngr.ISOLATED,
+                              anim=anim,
+                              day=day, 
+                              title=DataMngr.TITLE_ISOLATED,
+                              xlabel=DataMngr.XLABEL_ISOLATED,
+                              ratio=False,
+                              stable=stable,
+                              plot_name='Isolated BarH Plot',
+                              save=save)
+        return url
 
     def ratio_isolated_barh_plot(self, top, anim=True, day=None, stable=False, save=False):
         """
@@ -137,17 +286,17 @@ class PlotMngr:
             stable   - enable fixed axis, for all frames axis maximum limit is the same
             save     - enable saving plot, otherwise just show results on screen
         """
-        self.barh_plot(top=top, 
-                        target_col=DataMngr.RATIO_ISOLATED, 
-                        anim=anim,
-                        day=day,
-                        title=DataMngr.TITLE_RATIO_ISOLATED,
-                        xlabel=DataMngr.XLABEL_RATIO_ISOLATED,
-                        ratio=True,
-                        stable=stable,
-                        plot_name='Isolated-ratio BarH Plot',
-                        save=save)
-        return           
+        url = self.barh_plot(top=top, 
+                              target_col=DataMngr.RATIO_ISOLATED, 
+                              anim=anim,
+                              day=day,
+                              title=DataMngr.TITLE_RATIO_ISOLATED,
+                              xlabel=DataMngr.XLABEL_RATIO_ISOLATED,
+                              ratio=True,
+                              stable=stable,
+                              plot_name='Isolated-ratio BarH Plot',
+                              save=save)
+        return url
 
     def infected_isolated_barh_plot(self, top, anim=True, day=None, stable=False, save=False):
         """
@@ -159,176 +308,184 @@ class PlotMngr:
             stable   - enable fixed axis, for all frames axis maximum limit is the same
             save     - enable saving plot, otherwise just show results on screen
         """
-        self.data[DataMngr.RATIO_INFECTED_ISOLATED] = self.data[DataMngr.RATIO_INFECTED_ISOLATED].replace([np.inf, -np.inf], np.nan)
-        self.barh_plot(top=top, 
-                        target_col=DataMngr.RATIO_INFECTED_ISOLATED, 
-                        anim=anim,
-                        day=day,
-                        title=DataMngr.TITLE_INFECTED_ISOLATED,
-                        xlabel=DataMngr.XLABEL_INFECTED_ISOLATED,
-                        ratio=True,
-                        stable=stable,
-                        plot_name='Confirmed-Isolated BarH Plot',
-                        save=save)
-        return 
+        url = self.barh_plot(top=top, 
+                              target_col=DataMngr.RATIO_INFECTED_ISOLATED, 
+                              anim=anim,
+                              day=day,
+                              title=DataMngr.TITLE_INFECTED_ISOLATED,
+                              xlabel=DataMngr.XLABEL_INFECTED_ISOLATED,
+                              ratio=True,
+                              stable=stable,
+                              plot_name='Confirmed-Isolated BarH Plot',
+                              save=save)
+        return url
 
 
+    @TraceMngr.traced('plot')
     def map_bar_plot(self, top, target_col, anim, day, title, xlabel, ratio, stable, plot_name, save):
         """
         General function for plotting map of Serbia with a bar chart for each city/municipality
+        Returns location of saved plot, None if plot is shown on screen
         """
-        # Set target data
-        target_data = self.data[self.data[target_col].notna()]
-        target_data = target_data.sort_values(target_col, ascending=True, kind='mergesort').groupby(DataMngr.DATE).tail(top)
+        # Data with target column and its rank index, all cities/municipalities are shown if top is not given
+        data = self.metricmngr.frame(target_col)
+        ranks = self.rankmngr.get_index(target_col)
+        if top is None:
+            top = int(ranks.counts.max())
+
+        # Saved still image is served from the cache if it is already rendered
+        key = None
+        if not anim:
+            day_data = data.iloc[ranks.top_rows(top, ranks.get_day(day))]
+            if save and self.still_cache:
+                extremes = ranks.top_extremes(top) if stable else ()
+                figsize = (DataMngr.WIDTH_MAP, DataMngr.HEIGHT_MAP, DataMngr.DPI_MAP)
+                key = self.get_still_key(day_data, figsize, 'map', top, target_col, title, xlabel, ratio, stable, plot_name, *extremes)
+                cached, url = self.load_still(key, plot_name)
+                if cached:
+                    return url
 
         # Create chart
         self.chart = MapChart(title, xlabel, ratio, stable, top)
+        self.chart.verbose = self.verbose
+        self.chart.output = self.output
         self.chart.setup_axes()
         if stable:
-            minval = target_data[target_col].min()
-            maxval = target_data[target_col].max()
+            minval, maxval = ranks.top_extremes(top)
             self.chart.set_extremes(minval, maxval)
             self.chart.create_cmap(maxval)
 
         # Draw plot
         if anim:
-            target_data = target_data.groupby(DataMngr.DATE)
-            self.chart.set_frames(num_groups=len(target_data), date_frames=DataMngr.DAY_FRAMES_MAP)
-            the_anim = animation.FuncAnimation(self.chart.fig, 
-                                                self.chart.draw_anim,
-                                                fargs=(target_data, target_col),
-                                                init_func=self.chart.init_anim,  
-                                                frames=self.chart.total_frames, 
-                                                interval=DataMngr.INTERVAL_MAP, 
-                                                blit=True, 
-                                                repeat=False)
-            self.chart.anim = the_anim
+            plot_args = dict(top=top, target_col=target_col, anim=anim, day=day, title=title, xlabel=xlabel, \
+                ratio=ratio, stable=stable, plot_name=plot_name, save=save)
+            timeline = MapTimeline(top, DataMngr.DAY_FRAMES_MAP, MapChart.ALPHA, MapChart.THRESHOLD).compile(ranks)
+            url = self.animate('map_bar_plot', plot_args, timeline, DataMngr.INTERVAL_MAP, save)
+            if url is not None:
+                return url
         else:
-            # Setting data for choosen day
-            days = target_data.sort_index().loc[:pd.Timestamp(day)]
-            the_day = days.tail(1).index if len(days) > 0 else target_data.sort_index().head(1).index
-            target_data = target_data.loc[the_day]
             if not stable:
-                maxval = target_data[target_col].max()
+                maxval = day_data[target_col].max()
                 self.chart.create_cmap(maxval)
             # Drawing
             self.chart.draw_map()
-            self.chart.draw_img(target_data, target_col)
+            self.chart.draw_img(day_data, target_col)
             self.chart.create_cbar()
 
-        self.chart.display(save, plot_name)
-        return
+        url = self.chart.display(save, plot_name)
+        if key is not None:
+            self.save_still(key, url)
+        return url
 
     def infected_map_plot(self, top, anim=True, day=None, stable=False, save=False):
         """
         Plotting map of Serbia with a bar chart for each city/municipality of infected cases
         Parameters:
-            top      - number of top cities/municipalities shown in results
+            top      - number of top cities/municipalities shown in results, all of them if None
             anim     - enable animation
             day      - show results for specific day (only for images)
             stable   - enable fixed axis, for all frames axis maximum limit is the same
             save     - enable saving plot, otherwise just show results on screen
         """
-        self.map_bar_plot(top=top,
-                        target_col=DataMngr.INFECTED, 
-                        anim=anim,
-                        day=day,
-                        title=DataMngr.TITLE_INFECTED,
-                        xlabel=DataMngr.XLABEL_INFECTED,
-                        ratio=False,
-                        stable=stable,
-                        plot_name='Confirmed Map Plot',
-                        save=save)
-        return
+        url = self.map_bar_plot(top=top,
+                              target_col=DataMngr.INFECTED, 
+                              anim=anim,
+                              day=day,
+                              title=DataMngr.TITLE_INFECTED,
+                              xlabel=DataMngr.XLABEL_INFECTED,
+                              ratio=False,
+                              stable=stable,
+                              plot_name='Confirmed Map Plot',
+                              save=save)
+        return url
 
     def ratio_infected_map_plot(self, top, anim=True, day=None, stable=False, save=False):
         """
         Plotting map of Serbia with a bar chart for each city/municipality of infected cases to population ratio
         Parameters:
-            top      - number of top cities/municipalities shown in results
+            top      - number of top cities/municipalities shown in results, all of them if None
             anim     - enable animation
             day      - show results for specific day (only for images)
             stable   - enable fixed axis, for all frames axis maximum limit is the same
             save     - enable saving plot, otherwise just show results on screen
         """
-        self.map_bar_plot(top=top,
-                        target_col=DataMngr.RATIO_INFECTED, 
-                        anim=anim,
-                        day=day,
-                        title=DataMngr.TITLE_RATIO_INFECTED,
-                        xlabel=DataMngr.XLABEL_RATIO_INFECTED,
-                        ratio=True,
-                        stable=stable,
-                        plot_name='Confirmed-ratio Map Plot',
-                        save=save)
-        return
+        url = self.map_bar_plot(top=top,
+                              target_col=DataMngr.RATIO_INFECTED, 
+                              anim=anim,
+                              day=day,
+                              title=DataMngr.TITLE_RATIO_INFECTED,
+                              xlabel=DataMngr.XLABEL_RATIO_INFECTED,
+                              ratio=True,
+                              stable=stable,
+                              plot_name='Confirmed-ratio Map Plot',
+                              save=save)
+        return url
 
     def isolated_map_plot(self, top, anim=True, day=None, stable=False, save=False):
         """
         Plotting map of Serbia with a bar chart for each city/municipality of isolated cases
         Parameters:
-            top      - number of top cities/municipalities shown in results
+            top      - number of top cities/municipalities shown in results, all of them if None
             anim     - enable animation
             day      - show results for specific day (only for images)
             stable   - enable fixed axis, for all frames axis maximum limit is the same
             save     - enable saving plot, otherwise just show results on screen
         """
-        self.map_bar_plot(top=top,
-                        target_col=DataMngr.ISOLATED, 
-                        anim=anim,
-                        day=day,
-                        title=DataMngr.TITLE_ISOLATED,
-                        xlabel=DataMngr.XLABEL_ISOLATED,
-                        ratio=False,
-                        stable=stable,
-                        plot_name='Isolated Map Plot',
-                        save=save)
-        return
+        url = self.map_bar_plot(top=top,
+                              target_col=DataMngr.ISOLATED, 
+                              anim=anim,
+                              day=day,
+                              title=DataMngr.TITLE_ISOLATED,
+                              xlabel=DataMngr.XLABEL_ISOLATED,
+                              ratio=False,
+                              stable=stable,
+                              plot_name='Isolated Map Plot',
+                              save=save)
+        return url
 
     def ratio_isolated_map_plot(self, top, anim=True, day=None, stable=False, save=False):
         """
         Plotting map of Serbia with a bar chart for each city/municipality of isolated cases to population ratio
         Parameters:
-            top      - number of top cities/municipalities shown in results
+            top      - number of top cities/municipalities shown in results, all of them if None
             anim     - enable animation
             day      - show results for specific day (only for images)
             stable   - enable fixed axis, for all frames axis maximum limit is the same
             save     - enable saving plot, otherwise just show results on screen
         """
-        self.map_bar_plot(top=top,
-                        target_col=DataMngr.RATIO_ISOLATED, 
-                        anim=anim,
-                        day=day,
-                        title=DataMngr.TITLE_RATIO_ISOLATED,
-                        xlabel=DataMngr.XLABEL_RATIO_ISOLATED,
-                        ratio=True,
-                        stable=stable,
-                        plot_name='Isolated-ratio Map Plot',
-                        save=save)
-        return
+        url = self.map_bar_plot(top=top,
+                              target_col=DataMngr.RATIO_ISOLATED, 
+                              anim=anim,
+                              day=day,
+                              title=DataMngr.TITLE_RATIO_ISOLATED,
+                              xlabel=DataMngr.XLABEL_RATIO_ISOLATED,
+                              ratio=True,
+                              stable=stable,
+                              plot_name='Isolated-ratio Map Plot',
+                              save=save)
+        return url
 
     def infected_isolated_map_plot(self, top, anim=True, day=None, stable=False, save=False):
         """
         Plotting map of Serbia with a bar chart on the relation between infected and self-isolated cases by cities/municipalities
         Parameters:
-            top      - number of top cities/municipalities shown in results
+            top      - number of top cities/municipalities shown in results, all of them if None
             anim     - enable animation
             day      - show results for specific day (only for images)
             stable   - enable fixed axis, for all frames axis maximum limit is the same
             save     - enable saving plot, otherwise just show results on screen
         """
-        self.data[DataMngr.RATIO_INFECTED_ISOLATED] = self.data[DataMngr.RATIO_INFECTED_ISOLATED].replace([np.inf, -np.inf], np.nan)
-        self.map_bar_plot(top=top, 
-                        target_col=DataMngr.RATIO_INFECTED_ISOLATED, 
-                        anim=anim,
-                        day=day,
-                        title=DataMngr.TITLE_INFECTED_ISOLATED,
-                        xlabel=DataMngr.XLABEL_INFECTED_ISOLATED,
-                        ratio=True,
-                        stable=stable,
-                        plot_name='Confirmed-Isolated Map Plot',
-                        save=save)
-        return
+        url = self.map_bar_plot(top=top, 
+                              target_col=DataMngr.RATIO_INFECTED_ISOLATED, 
+                              anim=anim,
+                              day=day,
+                              title=DataMngr.TITLE_INFECTED_ISOLATED,
+                              xlabel=DataMngr.XLABEL_INFECTED_ISOLATED,
+                              ratio=True,
+                              stable=stable,
+                              plot_name='Confirmed-Isolated Map Plot',
+                              save=save)
+        return url
 
 
 if __name__ == "__main__": 
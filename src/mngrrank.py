@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+
+from mngrdata import DataMngr
+from mngrtrace import TraceMngr
+from mngrmetric import MetricMngr
+from mngrmatrix import MatrixStore
+
+
+class RankIndex:
+    """
+    Rank and value of every city/municipality for every day of single target column,
+    rows of each day are stored contiguously in ascending order of values,
+    cities/municipalities with equal values are ranked in order of their names
+    """
+
+    def __init__(self, store, target_col):
+        """
+        Parameters:
+            store       - matrix store of the data
+            target_col  - ranked column or derived metric, rows without finite value are not ranked
+        """
+        self.store = store
+        self.target_col = target_col
+        values = store.vector(target_col)
+        rows = np.flatnonzero(np.isfinite(values))
+        self.day_rows, day_codes = np.unique(store.day_codes[rows], return_inverse=True)
+        self.days = store.days[self.day_rows]
+        self.cities = store.cities
+
+        # Ascending values within each day, equal values in descending order of names so the first name ranks higher
+        order = np.lexsort((-store.city_order[store.city_codes[rows]], values[rows], day_codes))
+        self.rows = rows[order]
+        self.values = values[self.rows]
+        self.city_codes = store.city_codes[self.rows]
+        self.counts = np.bincount(day_codes, minlength=len(self.days))
+        self.starts = np.concatenate([[0], np.cumsum(self.counts)])
+
+        # Rank 1 is the highest value of the day, 0 if the city/municipality has no value for the day
+        day_sorted = day_codes[order]
+        self.rank = self.starts[day_sorted + 1] - np.arange(len(self.rows))
+        self.rank_table = np.zeros((len(self.days), len(self.cities)), dtype=np.int32)
+        self.rank_table[day_sorted, self.city_codes] = self.rank
+
+    def get_day(self, day=None):
+        """
+        Returns index of the last day not after given day, the first day if there is no such day,
+        the last day if day is not given
+        """
+        if day is None:
+            return len(self.days) - 1
+        return max(0, int(np.searchsorted(self.days, pd.Timestamp(day), side='right')) - 1)
+
+    def top_slice(self, top, ind_day):
+        """
+        Returns slice of sorted rows of top cities/municipalities for given day index
+        """
+        end = self.starts[ind_day + 1]
+        return slice(max(self.starts[ind_day], end - top), end)
+
+    def top_rows(self, top, ind_day=None):
+        """
+        Returns positions of data rows of top cities/municipalities in ascending order of values,
+        for given day index or for all days ordered by day
+        """
+        if ind_day is not None:
+            return self.rows[self.top_slice(top, ind_day)]
+        return self.rows[self.rank <= top]
+
+    def top_extremes(self, top):
+        """
+        Returns minimum and maximum value of top cities/municipalities over all days
+        """
+        values = self.values[self.rank <= top]
+        return values.min(), values.max()
+
+    def top(self, day, top):
+        """
+        Returns rank, name and value of top cities/municipalities for given day in descending order of values
+        """
+        day_slice = self.top_slice(top, self.get_day(day))
+        pos = np.arange(day_slice.stop - 1, day_slice.start - 1, -1)
+        return pd.DataFrame({'rank': self.rank[pos], DataMngr.CITY: self.cities[self.city_codes[pos]],
+                             self.target_col: self.values[pos]})
+
+    def rank_of(self, city, day):
+        """
+        Returns rank and value of the city/municipality for given day, None if it has no value for the day
+        """
+        ind_day = self.get_day(day)
+        i_city = self.store.city_ids.get(city)
+        if i_city is None or self.rank_table[ind_day, i_city] == 0:
+            return None
+        value = self.store.matrix(self.target_col)[self.day_rows[ind_day], i_city]
+        return int(self.rank_table[ind_day, i_city]), float(value)
+
+    def history(self, city):
+        """
+        Returns rank and value of the city/municipality for every day, rank is 0 for days without value
+        """
+        i_city = self.store.city_ids.get(city)
+        if i_city is None:
+            raise KeyError(city)
+        ranks = self.rank_table[:, i_city]
+        values = np.where(ranks > 0, self.store.matrix(self.target_col)[self.day_rows, i_city], np.nan)
+        return pd.DataFrame({'rank': ranks, self.target_col: values}, index=pd.Index(self.days, name=DataMngr.DATE))
+
+
+class RankMngr:
+    """
+    Ranking of cities/municipalities, rank index of each metric is built once on the first query
+    """
+    def __init__(self, data=None, store=None):
+        self.store = MatrixStore(MetricMngr(data)) if store is None else store
+        self.indices = {}
+
+    @TraceMngr.traced('rank')
+    def get_index(self, target_col):
+        """
+        Returns rank index of given target column
+        """
+        index = self.indices.get(target_col)
+        if index is None:
+            index = RankIndex(self.store, target_col)
+            self.indices[target_col] = index
+        return index
+
+    def top(self, target_col, day=None, top=20):
+        """
+        Returns top cities/municipalities of given day, the last day by default
+        """
+        return self.get_index(target_col).top(day, top)
+
+    def rank_of(self, target_col, city, day=None):
+        """
+        Returns rank and value of the city/municipality for given day, None if it has no value for the day
+        """
+        return self.get_index(target_col).rank_of(city, day)
+
+    def history(self, target_col, city):
+        """
+        Returns rank and value of the city/municipality for every day
+        """
+        return self.get_index(target_col).history(city)
+
+
+if __name__ == "__main__":
+    rankmngr = RankMngr()
+    print(rankmngr.top(DataMngr.INFECTED, '2020-04-10', 10))
+    print(rankmngr.rank_of(DataMngr.INFECTED, 'Ниш', '2020-04-10'))
+    print(rankmngr.history(DataMngr.INFECTED, 'Ниш').tail())
@@ -0,0 +1,94 @@
+
+import os
+import subprocess
+import numpy as np
+import matplotlib as mpl
+
+from concurrent.futures import ProcessPoolExecutor
+from mngrtrace import TraceMngr
+
+
+class RenderMngr:
+    """
+    Parallel rendering of animation frames across worker processes
+    """
+
+    WORKERS = os.cpu_count() or 1
+    SEGMENT = '{}.part{:03d}.mp4'
+    SEGMENT_LIST = '{}.parts.txt'
+
+
+    @staticmethod
+    def split_frames(total_frames, date_frames, workers):
+        """
+        Split frames into contiguous segments aligned to the first frame of the day
+        Returns list of segments (start, end)
+        """
+        num_days = total_frames // date_frames
+        num_segments = max(1, min(workers, num_days))
+        bounds = np.round(np.linspace(0, num_days, num_segments + 1)).astype(int) * date_frames
+        segments = [(int(start), int(end)) for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
+        return segments
+
+    @classmethod
+    def concat_segments(cls, urls, url):
+        """
+        Stitch video segments into single video without re-encoding
+        """
+        url_list = cls.SEGMENT_LIST.format(url)
+        with open(url_list, 'w') as file:
+            for url_segment in urls:
+                file.write("file '{}'\n".format(os.path.abspath(url_segment).replace("'", "'\\''")))
+
+        command = [mpl.rcParams['animation.ffmpeg_path'], '-y', '-loglevel', 'error', \
+            '-f', 'concat', '-safe', '0', '-i', url_list, '-c', 'copy', url]
+        try:
+            subprocess.run(command, check=True)
+        finally:
+            os.remove(url_list)
+        return url
+
+    @classmethod
+    def render(cls, render_segment, total_frames, date_frames, url, workers=None):
+        """
+        Render segments of animation in separate worker processes and stitch them into the final video,
+        stages traced in workers are merged into the trace of this process
+        Parameters:
+            render_segment  - function rendering frames [start, end) into given file, called as render_segment((start, end, url))
+            total_frames    - total number of frames
+            date_frames     - number of frames per date
+            url             - location of the final video
+            workers         - number of worker processes
+        """
+        workers = cls.WORKERS if workers is None else workers
+        segments = cls.split_frames(total_frames, date_frames, workers)
+        segments = [(start, end, cls.SEGMENT.format(url, i)) for i, (start, end) in enumerate(segments)]
+
+        try:
+            with ProcessPoolExecutor(max_workers=len(segments)) as executor:
+                urls = TraceMngr.map(executor, render_segment, segments)
+            cls.concat_segments(urls, url)
+        finally:
+            for _, _, url_segment in segments:
+                if os.path.isfile(url_segment):
+                    os.remove(url_segment)
+        return url
+
+    @classmethod
+    def render_batch(cls, render_job, jobs, workers=None):
+        """
+        Render independent jobs in separate worker processes, jobs are started in given order as workers become free,
+        stages traced in workers are merged into the trace of this process
+        Parameters:
+            render_job  - function rendering single job, called as render_job(job)
+            jobs        - list of jobs
+            workers     - number of worker processes
+        Returns list of results in order of jobs
+        """
+        workers = cls.WORKERS if workers is None else workers
+        if len(jobs) == 0:
+            return []
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            results = TraceMngr.map(executor, render_job, jobs)
+        return results
@@ -0,0 +1,220 @@
+import io
+import json
+import threading
+import pandas as pd
+
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ProcessPoolExecutor
+from mngrdata import DataMngr
+from mngrplot import PlotMngr
+
+
+class ServerMngr:
+    """
+    Local HTTP server rendering still images by worker processes with warm data, map and assets
+    """
+
+    METRICS = ['infected', 'ratio_infected', 'isolated', 'ratio_isolated', 'infected_isolated']
+    CHARTS = ['barh', 'map']
+    TRUE = ['1', 'true', 'yes']
+    FALSE = ['0', 'false', 'no']
+    CACHE_SIZE = 128            # number of cached responses
+    QUEUE_SIZE = 16             # number of requests rendered or waiting for worker
+    TIMEOUT = 60                # seconds
+    pltmgr = None               # plot manager of worker process
+
+
+    def __init__(self, workers=1, cache_size=CACHE_SIZE, queue_size=QUEUE_SIZE):
+        """
+        Parameters:
+            workers     - number of worker processes, each keeps its own copy of data
+            cache_size  - number of cached responses
+            queue_size  - number of requests rendered or waiting for worker, others are rejected
+        """
+        self.data = DataMngr.load_build_data(info=False)
+        self.last_day = pd.Timestamp(self.data.index.max()).strftime('%Y-%m-%d')
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=ServerMngr.init_worker, initargs=(self.data,))
+        self.cache_size = cache_size
+        self.cache = OrderedDict()      # request key -> png bytes, least recently used first
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(queue_size)
+        self.stats = dict(requests=0, hits=0, rejected=0)
+        self.verbose = False
+
+        # Start all workers, each loads assets before the first request
+        list(self.executor.map(ServerMngr.ping, range(workers)))
+
+    @classmethod
+    def init_worker(cls, data):
+        """
+        Create plot manager of worker process and warm up assets by rendering each chart type
+        """
+        import matplotlib.pyplot as plt
+        plt.switch_backend('Agg')
+        cls.pltmgr = PlotMngr(data=data, workers=1)
+        cls.pltmgr.verbose = False
+        for chart in cls.CHARTS:
+            cls.render_png(cls.get_method(cls.METRICS[0], chart), dict(top=20, anim=False, day=None, stable=False))
+        return
+
+    @staticmethod
+    def ping(_):
+        return True
+
+    @classmethod
+    def render_png(cls, plot_method, plot_args):
+        """
+        Render still image in worker process
+        Returns png bytes
+        """
+        import matplotlib.pyplot as plt
+        output = io.BytesIO()
+        cls.pltmgr.output = output
+        try:
+            getattr(cls.pltmgr, plot_method)(save=True, **plot_args)
+        finally:
+            cls.pltmgr.output = None
+            plt.close('all')
+        return output.getvalue()
+
+    @staticmethod
+    def get_method(metric, chart):
+        return '{}_{}_plot'.format(metric, chart)
+
+    @classmethod
+    def parse_flag(cls, value):
+        """
+        Returns boolean value of query parameter
+        """
+        if value.lower() in cls.TRUE:
+            return True
+        if value.lower() in cls.FALSE:
+            return False
+        raise ValueError('invalid flag: {}'.format(value))
+
+    def parse_query(self, query):
+        """
+        Returns plot method and arguments of the query, e.g. metric=ratio_infected&chart=map&day=2020-04-10&top=20&stable=true
+        Raises ValueError for invalid query
+        """
+        params = {name: values[-1] for name, values in parse_qs(query).items()}
+        metric = params.get('metric', self.METRICS[0])
+        chart = params.get('chart', self.CHARTS[0])
+        if metric not in self.METRICS:
+            raise ValueError('unknown metric: {}'.format(metric))
+        if chart not in self.CHARTS:
+            raise ValueError('unknown chart: {}'.format(chart))
+
+        day = pd.Timestamp(params.get('day', self.last_day)).strftime('%Y-%m-%d')
+        top = params.get('top', '20')
+        top = None if top.lower() in ['all', 'none'] and chart == 'map' else int(top)
+        if top is not None and top <= 0:
+            raise ValueError('invalid top: {}'.format(top))
+        stable = self.parse_flag(params.get('stable', 'false'))
+
+        plot_args = dict(top=top, anim=False, day=day, stable=stable)
+        return self.get_method(metric, chart), plot_args
+
+    def render(self, query):
+        """
+        Returns png bytes of the query from cache or rendered by worker process
+        Returns None if the server is overloaded
+        Raises ValueError for invalid query
+        """
+        plot_method, plot_args = self.parse_query(query)
+        key = (plot_method,) + tuple(sorted(plot_args.items()))
+        with self.lock:
+            self.stats['requests'] += 1
+            png = self.cache.get(key)
+            if png is not None:
+                self.stats['hits'] += 1
+                self.cache.move_to_end(key)
+                return png
+
+        # Bounded number of requests waiting for workers, the slot is held until the render is finished
+        # even if the request times out
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.stats['rejected'] += 1
+            return None
+        try:
+            future = self.executor.submit(ServerMngr.render_png, plot_method, plot_args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        png = future.result(timeout=self.TIMEOUT)
+
+        with self.lock:
+            self.cache[key] = png
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return png
+
+    def create_handler(self):
+        """
+        Returns request handler class bound to the server manager
+        """
+        srvmngr = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def send(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def send_text(self, status, text):
+                self.send(status, text.encode('utf-8'), 'text/plain; charset=utf-8')
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == '/stats':
+                    with srvmngr.lock:
+                        stats = dict(srvmngr.stats, cached=len(srvmngr.cache))
+                    self.send(200, json.dumps(stats).encode('utf-8'), 'application/json')
+                    return
+                if url.path != '/render':
+                    self.send_text(404, 'unknown path: {}'.format(url.path))
+                    return
+
+                try:
+                    png = srvmngr.render(url.query)
+                except ValueError as error:
+                    self.send_text(400, str(error))
+                    return
+                except Exception as error:
+                    self.send_text(500, 'rendering failed: {}'.format(error))
+                    return
+                if png is None:
+                    self.send_text(503, 'server is busy')
+                    return
+                self.send(200, png, 'image/png')
+
+            def log_message(self, format, *args):
+                if srvmngr.verbose:
+                    super().log_message(format, *args)
+
+        return Handler
+
+    def serve(self, host='127.0.0.1', port=8050, verbose=False):
+        """
+        Serve requests until interrupted
+        """
+        self.verbose = verbose
+        server = ThreadingHTTPServer((host, port), self.create_handler())
+        print('Serving on http://{}:{}/render?metric=ratio_infected&chart=map&day={}&top=20&stable=true'.format(
+            host, port, self.last_day))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.executor.shutdown(wait=True)
+        return
@@ -0,0 +1,157 @@
+import os
+import csv
+import shutil
+import itertools
+import numpy as np
+import pandas as pd
+import cyrtranslit
+
+from configparser import ConfigParser
+
+
+class SynthMngr:
+    """
+    Generating synthetic input data of given size in the formats of the real input files
+    """
+
+    SYLLABLES = ['ba', 'be', 'bo', 'ce', 'da', 'di', 'go', 'ja', 'ka', 'ki', 'la', 'le', 'lo', 'ma', 'mi',
+                 'na', 'no', 'pa', 'pe', 'ra', 'ri', 'sa', 'se', 'ta', 'to', 'va', 'vi', 'za', 'zo', 'tu']
+    LATITUDE = (42.4, 46.0)
+    LONGITUDE = (19.2, 22.8)
+    POPULATION = (2000, 500000)
+    START_DAY = '2020-03-06'
+    START_TIMESTAMP = 1586790450809         # milliseconds, daily statistic files are named by timestamp
+    NEWS_DAYS = 5                           # the News are given every NEWS_DAYS days
+    POPUL_HEADER_ROWS = 7
+    POPUL_FOOTER_ROWS = 44
+    STAT_HEADERS = {
+        'infected': [['COVID19 статистике', None, ''], ['COVID-19 статистике заражени', 'Заражено укупно', '']],
+        'isolated': [['COVID19 самоизолације', None, ''], ['COVID-19 статистике изолације', 'Број самоизолованих', '']],
+    }
+    STAT_CAPTION = ['Ранк', 'Територија', 'Вредност']
+    GEO_COLUMNS = ['city', 'lat', 'lng', 'country', 'iso2', 'admin', 'capital', 'population', 'population_proper']
+
+
+    def __init__(self, root_dir, municipalities, days, seed=0):
+        """
+        Parameters:
+            root_dir        - root directory of generated project data, used as COVID19_ROOT
+            municipalities  - number of cities/municipalities
+            days            - number of days of daily statistics
+            seed            - seed of random generator
+        """
+        self.root_dir = root_dir
+        self.municipalities = municipalities
+        self.days = days
+        self.rng = np.random.default_rng(seed)
+
+    @classmethod
+    def create_names(cls, count):
+        """
+        Returns list of unique Latin names of cities/municipalities
+        """
+        if count > len(cls.SYLLABLES) ** 2 + len(cls.SYLLABLES) ** 3:
+            raise ValueError('At most {} cities/municipalities are supported'.format(len(cls.SYLLABLES) ** 2 + len(cls.SYLLABLES) ** 3))
+        names = []
+        for length in (2, 3):
+            for syllables in itertools.product(cls.SYLLABLES, repeat=length):
+                names.append(''.join(syllables).capitalize())
+        return names[:count]
+
+    def copy_static(self, src_root):
+        """
+        Copy configuration, map and logo from the project, returns configuration
+        """
+        for dirname in ['config', 'data/map', 'data/logo']:
+            shutil.copytree(os.path.join(src_root, dirname), os.path.join(self.root_dir, dirname), dirs_exist_ok=True)
+        config = ConfigParser()
+        config.read(os.path.join(self.root_dir, 'config', 'config.ini'))
+        return config
+
+    def write_statistic(self, dirname, days, names, values):
+        """
+        Write daily statistic files with cumulative values of cities/municipalities
+        """
+        url_dir = os.path.join(self.root_dir, 'data/input', dirname)
+        os.makedirs(url_dir, exist_ok=True)
+        for i_day, day in enumerate(days):
+            order = np.argsort(-values[i_day], kind='mergesort')
+            ranks = pd.Series(values[i_day][order]).rank(method='min', ascending=False).astype(int)
+            header = [[text if text is not None else day.strftime('%Y-%m-%d') for text in row] for row in self.STAT_HEADERS[dirname]]
+
+            filename = 'statistic{}.csv'.format(self.START_TIMESTAMP + i_day * 86400000)
+            with open(os.path.join(url_dir, filename), 'w', encoding='utf-8-sig', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerows(header)
+                writer.writerow(self.STAT_CAPTION)
+                for rank, i_city in zip(ranks, order):
+                    writer.writerow([rank, names[i_city], float(values[i_day][i_city])])
+        return
+
+    def write_population(self, filename, names, population):
+        """
+        Write Excel file of population with header and footer rows of the statistical yearbook
+        """
+        rows = [['1.1. ОПШТИ ПОДАЦИ'] + [None] * 7] + [[None] * 8] * (self.POPUL_HEADER_ROWS - 1)
+        for name, value in zip(names, population):
+            rows.append([name, 100, 10, int(value), value / 100, 10, 10, '-'])
+        rows += [['{}) Напомена.'.format(i + 1)] + [None] * 7 for i in range(self.POPUL_FOOTER_ROWS)]
+        pd.DataFrame(rows).to_excel(os.path.join(self.root_dir, 'data/input', filename), header=False, index=False)
+        return
+
+    def write_geo(self, filename, names, population):
+        """
+        Write csv file of geographic coordinates
+        """
+        geo = pd.DataFrame({
+            'city': names,
+            'lat': self.rng.uniform(*self.LATITUDE, len(names)).round(6),
+            'lng': self.rng.uniform(*self.LONGITUDE, len(names)).round(6),
+            'country': 'Serbia',
+            'iso2': 'RS',
+            'admin': names,
+            'capital': 'admin',
+            'population': population,
+            'population_proper': population,
+        }, columns=self.GEO_COLUMNS)
+        geo.to_csv(os.path.join(self.root_dir, 'data/input', filename), index=False)
+        return
+
+    def write_news(self, filename, days):
+        """
+        Write Excel file of the News in all languages
+        """
+        news_days = days[::self.NEWS_DAYS]
+        news = pd.DataFrame({
+            'date': news_days,
+            'rs': ['Вест број {}. Друга реченица.'.format(i + 1) for i in range(len(news_days))],
+            'en': ['News number {}. Second sentence.'.format(i + 1) for i in range(len(news_days))],
+        })
+        news.to_excel(os.path.join(self.root_dir, 'data/input', filename), index=False)
+        return
+
+    def generate(self, src_root):
+        """
+        Generate configuration and input files of the project into the root directory
+        Parameters:
+            src_root - root directory of the project, source of configuration, map and logo
+        """
+        config = self.copy_static(src_root)
+        os.makedirs(os.path.join(self.root_dir, 'data/input'), exist_ok=True)
+
+        latin_names = self.create_names(self.municipalities)
+        names = [cyrtranslit.to_cyrillic(name) for name in latin_names]
+        days = pd.date_range(self.START_DAY, periods=self.days, freq='D')
+        population = self.rng.integers(*self.POPULATION, self.municipalities)
+
+        # Cumulative cases grow from few cities/municipalities to all of them
+        growth = self.rng.poisson(self.rng.uniform(0, 3, self.municipalities), (self.days, self.municipalities))
+        infected = np.cumsum(growth, axis=0).astype(np.float64)
+        isolated = np.cumsum(growth * self.rng.integers(2, 10, self.municipalities), axis=0).astype(np.float64)
+
+        self.write_statistic('infected', days, names, infected)
+        self.write_statistic('isolated', days, names, isolated)
+        self.write_population(config.get('file', 'POPUL_FILENAME'), names, population)
+        self.write_geo(config.get('file', 'GEO_FILENAME'), latin_names, population)
+        self.write_news(config.get('file', 'NEWS_FILENAME'), days)
+        return self.root_dir
@@ -0,0 +1,262 @@
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+import functools
+import numpy as np
+
+from collections import deque
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class Span:
+    """
+    Traced stage, records wall and CPU time of the enclosed code
+    """
+    __slots__ = ('name', 'cat', 'start', 'cpu')
+
+    def __init__(self, name, cat):
+        self.name = name
+        self.cat = cat
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        self.cpu = time.process_time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        TraceMngr.record(self.name, self.cat, self.start, time.perf_counter_ns(), time.process_time_ns() - self.cpu)
+        return False
+
+
+class NullSpan:
+    """
+    Span used when tracing is disabled
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+class TraceMngr:
+    """
+    Opt-in tracing of wall time, CPU time and peak RSS of stages in the current process,
+    enabled by TraceMngr.enable() or by environment variable COVID19_TRACE with location of the trace file
+    """
+
+    ENV_TRACE = 'COVID19_TRACE'
+    BUCKETS = [0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]    # upper bounds in ms
+    RSS_UNIT = 1 if sys.platform == 'darwin' else 1024                                  # bytes of ru_maxrss
+    NULL_SPAN = NullSpan()
+    MAX_EVENTS = 200000                                                                 # the oldest events are dropped
+
+    enabled = False
+    url = None
+    origin = 0
+    dropped = 0
+    events = deque(maxlen=MAX_EVENTS)   # (name, category, start ns, end ns, cpu ns, peak rss bytes, process id, thread id)
+
+
+    @classmethod
+    def enable(cls, url=None):
+        """
+        Start recording, the trace is exported into given file at exit
+        """
+        if not cls.enabled:
+            cls.origin = time.perf_counter_ns()
+            cls.enabled = True
+        if url is not None and cls.url is None:
+            atexit.register(cls.finish)
+        cls.url = url
+        return
+
+    @classmethod
+    def disable(cls):
+        cls.enabled = False
+        return
+
+    @classmethod
+    def reset(cls):
+        cls.events = deque(maxlen=cls.MAX_EVENTS)
+        cls.dropped = 0
+        cls.origin = time.perf_counter_ns()
+        return
+
+    @classmethod
+    def collect(cls):
+        """
+        Returns recorded events and clears them
+        """
+        events = list(cls.events)
+        cls.events.clear()
+        return events
+
+    @classmethod
+    def merge(cls, events):
+        """
+        Add events recorded in other process, e.g. returned by worker process
+        """
+        for event in events:
+            if len(cls.events) == cls.events.maxlen:
+                cls.dropped += 1
+            cls.events.append(event)
+        return
+
+    @classmethod
+    def run_worker(cls, enabled, func, *args):
+        """
+        Call function in worker process with tracing enabled as in the parent process,
+        events inherited from the parent are dropped and the trace is not exported by the worker
+        Returns result of the function with events recorded during the call, to be merged by the parent
+        """
+        cls.url = None
+        if enabled and not cls.enabled:
+            cls.enable()
+        cls.events.clear()
+        result = func(*args)
+        return result, cls.collect()
+
+    @classmethod
+    def map(cls, executor, func, iterable):
+        """
+        Map function over iterable in worker processes of executor, events of workers are merged
+        Returns list of results
+        """
+        results = []
+        for result, events in executor.map(functools.partial(cls.run_worker, cls.enabled, func), iterable):
+            cls.merge(events)
+            results.append(result)
+        return results
+
+    @staticmethod
+    def get_peak_rss():
+        """
+        Returns peak resident set size of the process in bytes, 0 if it is not available
+        """
+        if resource is None:
+            return 0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * TraceMngr.RSS_UNIT
+
+    @classmethod
+    def record(cls, name, cat, start, end, cpu):
+        if len(cls.events) == cls.events.maxlen:
+            cls.dropped += 1
+        cls.events.append((name, cat, start, end, cpu, cls.get_peak_rss(), os.getpid(), threading.get_ident()))
+        return
+
+    @classmethod
+    def span(cls, name, cat=''):
+        """
+        Returns context manager tracing the enclosed code, it does nothing if tracing is disabled
+        """
+        if not cls.enabled:
+            return cls.NULL_SPAN
+        return Span(name, cat)
+
+    @classmethod
+    def traced(cls, cat=''):
+        """
+        Decorator tracing calls of the function under its qualified name
+        """
+        def decorator(func):
+            name = func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not cls.enabled:
+                    return func(*args, **kwargs)
+                with Span(name, cat):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+
+    @classmethod
+    def summary(cls):
+        """
+        Returns statistics of recorded stages: count, wall and CPU times in ms, peak RSS in MB
+        and histogram of wall times with upper bounds BUCKETS
+        """
+        stages = {}
+        for name, cat, start, end, cpu, rss, _, _ in cls.events:
+            stage = stages.setdefault(name, dict(cat=cat, wall=[], cpu=[], rss=0))
+            stage['wall'].append((end - start) / 1e6)
+            stage['cpu'].append(cpu / 1e6)
+            stage['rss'] = max(stage['rss'], rss)
+
+        summary = {}
+        for name, stage in stages.items():
+            wall = np.array(stage['wall'])
+            p50, p90, p99 = np.percentile(wall, [50, 90, 99])
+            histogram = np.bincount(np.searchsorted(cls.BUCKETS, wall), minlength=len(cls.BUCKETS) + 1)
+            summary[name] = dict(cat=stage['cat'], count=len(wall), total=wall.sum(), cpu=float(np.sum(stage['cpu'])),
+                                 mean=wall.mean(), p50=p50, p90=p90, p99=p99, max=wall.max(),
+                                 peak_rss=stage['rss'] / 2**20, histogram=histogram.tolist())
+        return summary
+
+    @classmethod
+    def print_summary(cls):
+        """
+        Print statistics of recorded stages ordered by total wall time
+        """
+        summary = cls.summary()
+        print('{:<40} {:>7} {:>10} {:>10} {:>9} {:>9} {:>9} {:>9} {:>8}'.format(
+            'stage', 'count', 'total ms', 'cpu ms', 'p50 ms', 'p90 ms', 'p99 ms', 'max ms', 'rss MB'))
+        for name, stage in sorted(summary.items(), key=lambda item: -item[1]['total']):
+            print('{:<40} {:>7d} {:>10.1f} {:>10.1f} {:>9.2f} {:>9.2f} {:>9.2f} {:>9.2f} {:>8.1f}'.format(
+                name[:40], stage['count'], stage['total'], stage['cpu'], stage['p50'], stage['p90'], stage['p99'],
+                stage['max'], stage['peak_rss']))
+
+        # Histograms of stages with many calls, e.g. frame phases
+        labels = ['<{}'.format(bound) for bound in cls.BUCKETS] + ['>={}'.format(cls.BUCKETS[-1])]
+        for name, stage in summary.items():
+            if stage['count'] < 10:
+                continue
+            bins = ['{} ms: {}'.format(label, count) for label, count in zip(labels, stage['histogram']) if count > 0]
+            print('{:<40} {}'.format(name[:40], ', '.join(bins)))
+        return
+
+    @classmethod
+    def export(cls, url):
+        """
+        Export recorded stages in Chrome trace event format, viewable in Perfetto or chrome://tracing
+        """
+        trace = []
+        for name, cat, start, end, cpu, rss, pid, tid in cls.events:
+            trace.append(dict(name=name, cat=cat, ph='X', pid=pid, tid=tid,
+                              ts=(start - cls.origin) / 1e3, dur=(end - start) / 1e3,
+                              args=dict(cpu_ms=cpu / 1e6, peak_rss_mb=rss / 2**20)))
+            trace.append(dict(name='peak_rss', ph='C', pid=pid, tid=tid, ts=(end - cls.origin) / 1e3,
+                              args=dict(MB=rss / 2**20)))
+
+        os.makedirs(os.path.dirname(os.path.abspath(url)), exist_ok=True)
+        with open(url, 'w') as file:
+            json.dump(dict(traceEvents=trace, displayTimeUnit='ms'), file)
+        return url
+
+    @classmethod
+    def finish(cls):
+        """
+        Export trace into the file given at enabling and print summary
+        """
+        if cls.url is None or len(cls.events) == 0:
+            return
+        cls.print_summary()
+        if cls.dropped > 0:
+            print('Oldest {} stages were dropped, at most {} are kept'.format(cls.dropped, cls.events.maxlen))
+        print('Trace of {} stages saved into {}'.format(len(cls.events), cls.export(cls.url)))
+        return
+
+
+if os.environ.get(TraceMngr.ENV_TRACE):
+    TraceMngr.enable(os.environ[TraceMngr.ENV_TRACE])
@@ -0,0 +1,52 @@
+import os
+import sys
+import struct
+import pytest
+
+SRC_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SRC_ROOT, 'src'))
+
+
+@pytest.fixture(scope='module')
+def plotmngr(tmp_path_factory):
+    """
+    Returns plot manager on small synthetic data, modules are imported after the root directory of data is set
+    """
+    from mngrsynth import SynthMngr
+    root_dir = SynthMngr(str(tmp_path_factory.mktemp('covid19')), 12, 5).generate(SRC_ROOT)
+    os.environ['COVID19_ROOT'] = root_dir
+    import matplotlib
+    matplotlib.use('Agg')
+    from mngrdata import DataMngr
+    from mngrplot import PlotMngr
+    os.makedirs(DataMngr.OUTPUT_DIR, exist_ok=True)
+    pltmgr = PlotMngr()
+    pltmgr.verbose = False
+    return pltmgr
+
+
+def png_size(url):
+    """
+    Returns width and height of PNG image
+    """
+    with open(url, 'rb') as file:
+        header = file.read(24)
+    return struct.unpack('>II', header[16:24])
+
+
+@pytest.mark.parametrize('attr, scale', [('DPI_BARH', 0.5), ('WIDTH_BARH', 0.5), ('HEIGHT_BARH', 0.5)])
+def test_still_cache_misses_on_figure_size(plotmngr, monkeypatch, attr, scale):
+    from mngrdata import DataMngr
+    url = plotmngr.infected_barh_plot(top=5, anim=False, save=True)
+    width, height = png_size(url)
+    assert png_size(plotmngr.infected_barh_plot(top=5, anim=False, save=True)) == (width, height)
+
+    monkeypatch.setattr(DataMngr, attr, getattr(DataMngr, attr) * scale)
+    resized = png_size(plotmngr.infected_barh_plot(top=5, anim=False, save=True))
+    plotmngr.still_cache = False
+    try:
+        rendered = png_size(plotmngr.infected_barh_plot(top=5, anim=False, save=True))
+    finally:
+        plotmngr.still_cache = True
+    assert resized == rendered
+    assert resized != (width, height)